@@ -614,7 +614,7 @@ class ConsultEaseApp:
             logger.info(f"Updating dashboard with new student: {student_name}")
 
             # Store the new student data
-            self.dashboard_window.student = student_data
+            self.dashboard_window.set_student(student_data)
 
             # Update only student-specific elements without full UI rebuild
             # This prevents MQTT subscription multiplication
@@ -11,10 +11,19 @@ import time
 import uuid  # Added import for uuid
 from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, Empty
-from typing import Dict, Callable, Optional, Any
+from typing import Dict, Callable, List, Optional, Any
 import paho.mqtt.client as mqtt
 from collections import defaultdict
 
+# orjson parses MQTT payloads several times faster than the stdlib decoder;
+# fall back to json when it is not installed. Both return plain dicts/lists and
+# raise a json.JSONDecodeError subclass on malformed input.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -188,8 +197,8 @@ class AsyncMQTTService:
                     logger.warning(f"Received empty payload for topic '{topic}', skipping")
                     return
                     
-                # Try to parse as JSON
-                data = json.loads(payload)
+                # Try to parse as JSON; handlers receive the decoded dict and use .get() access
+                data = _json_loads(payload)
             except json.JSONDecodeError as je:
                 # If not JSON, treat as string but validate it's reasonable
                 if len(payload) > 10000:  # Prevent extremely large payloads
@@ -610,6 +619,37 @@ class AsyncMQTTService:
         total_handlers = len(self.message_handlers[topic])
         logger.info(f"✅ Registered handler for topic '{topic}' (total handlers for this topic: {total_handlers})")
 
+    def register_topic_handlers(self, topics: List[str], handler: Callable, qos: int = 0):
+        """
+        Register one handler for several topics using a single SUBSCRIBE packet.
+
+        Args:
+            topics: MQTT topics (support wildcards + and #)
+            handler: Callable that takes (topic, data) as arguments
+            qos: Quality of service level requested for every topic
+        """
+        topics = list(topics)
+        if not topics:
+            return
+
+        with self.handler_lock:
+            for topic in topics:
+                self.message_handlers[topic].append(handler)
+
+        # Subscribe to all topics in one round-trip if connected
+        if self.is_connected and self.client:
+            try:
+                result, mid = self.client.subscribe([(topic, qos) for topic in topics])
+                if result == mqtt.MQTT_ERR_SUCCESS:
+                    self.pending_subscriptions[mid] = ", ".join(topics)
+                    logger.info(f"Subscription request sent for {len(topics)} topics, mid: {mid}")
+                else:
+                    logger.error(f"Failed to send subscription request for topics {topics} during registration. Paho error code: {result}")
+            except Exception as e:
+                logger.error(f"Error subscribing to topics {topics}: {e}")
+
+        logger.info(f"✅ Registered handler for {len(topics)} topics: {topics}")
+
     def unregister_topic_handler(self, topic: str):
         """Unregister a topic handler."""
         with self.handler_lock:
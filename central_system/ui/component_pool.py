@@ -91,13 +91,16 @@ class ComponentPool(QObject):
         
         return component
     
-    def return_component(self, component_id: str, component_type: str) -> bool:
+    def return_component(self, component_id: str, component_type: str,
+                         keep_parent: bool = False) -> bool:
         """
         Return a component to the pool for reuse.
         
         Args:
             component_id: Unique identifier of the component
             component_type: Type identifier for the component
+            keep_parent: Leave the component attached to its parent widget
+                so it can be reused in place without re-parenting
             
         Returns:
             bool: True if component was returned to pool, False otherwise
@@ -115,7 +118,7 @@ class ComponentPool(QObject):
         
         if len(self.pools[component_type]) < self.max_pool_size:
             # Clean up component before pooling
-            self._cleanup_component(component)
+            self._cleanup_component(component, keep_parent=keep_parent)
             
             # Add to pool
             self.pools[component_type].append(component)
@@ -166,12 +169,13 @@ class ComponentPool(QObject):
         except Exception as e:
             logger.warning(f"Error resetting component: {e}")
     
-    def _cleanup_component(self, component: QWidget):
+    def _cleanup_component(self, component: QWidget, keep_parent: bool = False):
         """
         Clean up component before returning to pool.
         
         Args:
             component: Component to clean up
+            keep_parent: Leave the component attached to its parent widget
         """
         try:
             # Disconnect all signals
@@ -179,7 +183,7 @@ class ComponentPool(QObject):
                 component.disconnect()
             
             # Remove from parent
-            if component.parent():
+            if component.parent() and not keep_parent:
                 component.setParent(None)
             
             # Hide component
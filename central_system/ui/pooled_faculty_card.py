@@ -39,6 +39,9 @@ class PooledFacultyCard(QWidget):
         self.faculty_data = None
         self.consultation_callback = None
 
+        # Last status styled by the dashboard (skips redundant style refreshes)
+        self._last_status = None
+
         # Setup UI
         self._setup_ui()
 
@@ -141,6 +144,7 @@ class PooledFacultyCard(QWidget):
         self.faculty_id = faculty_data.get('id')
         self.consultation_callback = consultation_callback
         self.is_active = True
+        self._last_status = None
 
         # Update UI elements
         self._update_display()
@@ -262,6 +266,7 @@ class PooledFacultyCard(QWidget):
         self.faculty_data = None
         self.consultation_callback = None
         self.is_active = False
+        self._last_status = None
 
         # Reset UI elements
         self.name_label.setText("")
@@ -409,12 +414,13 @@ class FacultyCardManager:
         logger.debug(f"Retrieved faculty card for faculty {faculty_id}")
         return card
 
-    def return_faculty_card(self, faculty_id: int):
+    def return_faculty_card(self, faculty_id: int, keep_parent: bool = False):
         """
         Return a faculty card to the pool.
 
         Args:
             faculty_id: ID of the faculty whose card to return
+            keep_parent: Leave the card inside its current container widget
         """
         if faculty_id not in self.active_cards:
             logger.warning(f"Attempted to return unknown faculty card: {faculty_id}")
@@ -426,7 +432,7 @@ class FacultyCardManager:
         card.reset()
 
         # Return to pool
-        self.component_pool.return_component(component_id, "faculty_card")
+        self.component_pool.return_component(component_id, "faculty_card", keep_parent=keep_parent)
 
         logger.debug(f"Returned faculty card for faculty {faculty_id}")
 
@@ -449,6 +455,33 @@ class FacultyCardManager:
 
         logger.info("Cleared all faculty cards")
 
+    def detach_all_from_layout(self, layout) -> list:
+        """
+        Empty a layout and return all active cards to the pool without re-parenting them.
+
+        The removed widgets are hidden rather than deleted and each card stays in its
+        container, so a later populate can reuse the container and card in place.
+
+        Args:
+            layout: Layout holding the faculty card containers
+
+        Returns:
+            list: Widgets removed from the layout
+        """
+        removed = []
+        # Take items from the end so Qt doesn't shift the item list on every removal
+        for i in range(layout.count() - 1, -1, -1):
+            widget = layout.takeAt(i).widget()
+            if widget is not None:
+                widget.hide()
+                removed.append(widget)
+
+        for faculty_id in list(self.active_cards.keys()):
+            self.return_faculty_card(faculty_id, keep_parent=True)
+
+        logger.debug(f"Detached {len(removed)} widgets from layout")
+        return removed
+
     def get_stats(self) -> dict:
         """
         Get statistics about faculty card usage.
@@ -123,6 +123,28 @@ def subscribe_to_topic(topic: str, callback: callable) -> bool:
         return False
 
 
+def subscribe_to_topics(topics: list, callback: callable, qos: int = 0) -> bool:
+    """
+    Subscribe to several MQTT topics with one callback in a single SUBSCRIBE.
+
+    Args:
+        topics: MQTT topics to subscribe to
+        callback: Function to call when a message is received on any topic
+        qos: Quality of service level requested for every topic
+
+    Returns:
+        bool: True if subscription was successful, False otherwise
+    """
+    try:
+        service = get_mqtt_service()
+        service.register_topic_handlers(topics, callback, qos)
+        logger.info(f"✅ Subscribed to MQTT topics: {list(topics)}")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to subscribe to topics {list(topics)}: {e}")
+        return False
+
+
 def get_mqtt_stats() -> dict:
     """
     Get MQTT service statistics.
@@ -8,6 +8,7 @@ from PyQt5.QtGui import QPixmap
 import os
 import logging
 import time
+import threading
 from .base_window import BaseWindow
 from .consultation_panel import ConsultationPanel
 from ..utils.ui_components import FacultyCard
@@ -17,10 +18,43 @@ from ..utils.ui_performance import (
     batch_ui_update, timed_ui_update
 )
 from ..utils.inactivity_monitor import get_inactivity_monitor
+from ..utils.mqtt_utils import subscribe_to_topic
+from ..utils.mqtt_topics import MQTTTopics
+from ..controllers.faculty_controller import get_faculty_controller
+from ..controllers.faculty_response_controller import get_faculty_response_controller
+
+try:
+    from ..utils.notification import NotificationManager
+except ImportError:
+    # Fallback to basic message boxes if notification manager is not available
+    NotificationManager = None
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# message_type -> (title, NotificationManager type attribute)
+_MESSAGE_TYPE_NOTIFICATIONS = {
+    "success": ("Success", "SUCCESS"),
+    "error": ("Error", "ERROR"),
+    "warning": ("Warning", "WARNING"),
+}
+_DEFAULT_MESSAGE_TYPE_NOTIFICATION = ("Information", "INFO")
+
+# Faculty response_type -> (title, message template, NotificationManager type attribute)
+_RESPONSE_NOTIFICATIONS = {
+    "ACKNOWLEDGE": ("Consultation Accepted!", "{name} has accepted your consultation request.", "SUCCESS"),
+    "ACCEPTED": ("Consultation Accepted!", "{name} has accepted your consultation request.", "SUCCESS"),
+    "BUSY": ("Faculty Busy", "{name} is currently busy and cannot take your consultation request.", "WARNING"),
+    "UNAVAILABLE": ("Faculty Busy", "{name} is currently busy and cannot take your consultation request.", "WARNING"),
+    "REJECTED": ("Consultation Declined", "{name} has declined your consultation request.", "ERROR"),
+    "DECLINED": ("Consultation Declined", "{name} has declined your consultation request.", "ERROR"),
+    "COMPLETED": ("Consultation Completed", "Your consultation with {name} has been completed.", "INFO"),
+}
+_DEFAULT_RESPONSE_NOTIFICATION = ("Consultation Update", "{name} has responded to your consultation request.", "INFO")
+
+# Notification types shown with a warning icon when falling back to QMessageBox
+_WARNING_NOTIFICATION_TYPES = frozenset(("WARNING", "ERROR"))
+
 
 
 class ConsultationRequestForm(QFrame):
@@ -217,6 +251,10 @@ class DashboardWindow(BaseWindow):
     # Signal to handle consultation request
     consultation_requested = pyqtSignal(object, str, str)
     request_ui_refresh = pyqtSignal()
+    # Normalized (faculty_id, display_status) handed from the MQTT thread to the GUI thread
+    status_event = pyqtSignal(int, str)
+    # Consultation history refresh requested from the faculty response callback thread
+    history_refresh_requested = pyqtSignal()
 
     def __init__(self, student=None, parent=None):
         """
@@ -227,7 +265,9 @@ class DashboardWindow(BaseWindow):
             parent: Parent widget (optional)
         """
         # 🔧 FIX: Initialize all members to None *before* calling super().__init__()
-        self.student = student
+        self.student = None
+        self._student_id = None
+        self.set_student(student)
         self.faculty_card_manager = None
         self.consultation_panel = None
         self.faculty_grid = None
@@ -240,12 +280,45 @@ class DashboardWindow(BaseWindow):
         self._last_faculty_hash = None
         self._last_refresh_time = 0
         self._min_refresh_interval = 1.0  # Minimum 1 second between full refreshes
+        self._faculty_card_index = {}  # faculty_id -> faculty card currently in the grid
+        self._idle_card_containers = set()  # Hidden containers still holding a pooled card
+        self._faculty_loaded = False  # Set once the grid holds faculty cards
+        self._mqtt_dispatch = {}  # topic last level -> MQTT handler
+
+        # Coalesced faculty status updates shared by both MQTT notification paths
+        self._status_lock = threading.Lock()
+        self._last_applied_status = {}  # faculty_id -> (display_status, monotonic time)
+        self._pending_status_updates = {}  # faculty_id -> display_status (GUI thread only)
+        self._status_dedup_window = 1.0  # Drop identical updates within 1 second
+
+        # Initial DB load waits for a quiet MQTT window instead of a fixed delay
+        self._initial_load_armed = False
+        self._last_mqtt_arrival = 0.0  # monotonic time of the last status message
+        self._mqtt_quiet_window = 0.2  # seconds without status messages before loading
 
         # Call parent constructor, which will call init_ui()
         super().__init__(parent)
         
         # 🔧 REMOVED: All the self.xxx = None assignments from here.
 
+        # Apply MQTT status changes on the GUI thread in one coalesced pass
+        self._status_flush_timer = QTimer(self)
+        self._status_flush_timer.setSingleShot(True)
+        self._status_flush_timer.setInterval(0)
+        self._status_flush_timer.timeout.connect(self._flush_status_updates)
+        self.status_event.connect(self._apply_status_event, Qt.QueuedConnection)
+
+        # Refresh consultation history once per burst of faculty responses
+        self._history_refresh_timer = QTimer(self)
+        self._history_refresh_timer.setSingleShot(True)
+        self._history_refresh_timer.setInterval(200)
+        self._history_refresh_timer.timeout.connect(self._refresh_consultation_history)
+        self.history_refresh_requested.connect(self._schedule_history_refresh, Qt.QueuedConnection)
+
+        self._initial_load_timer = QTimer(self)
+        self._initial_load_timer.setSingleShot(True)
+        self._initial_load_timer.timeout.connect(self._check_initial_faculty_load)
+
         # Set up real-time updates for consultation status
         self.setup_real_time_updates()
 
@@ -255,22 +328,33 @@ class DashboardWindow(BaseWindow):
         # Connect refresh request signal to throttled refresh
         self.request_ui_refresh.connect(self.refresh_faculty_status_throttled)
 
-        # Delay initial faculty data load until UI is fully ready
-        from PyQt5.QtCore import QTimer
-        QTimer.singleShot(100, self._perform_initial_faculty_load)
+        # Load initial faculty data once the UI is ready and MQTT traffic is quiet
+        self._arm_initial_faculty_load()
 
         # Setup inactivity monitoring
         self.setup_inactivity_monitor()
 
         logger.info(f"Dashboard initialized with student: ID={student.get('id') if isinstance(student, dict) else getattr(student, 'id', 'Unknown')}, Name={student.get('name') if isinstance(student, dict) else getattr(student, 'name', 'Unknown')}, RFID={student.get('rfid_uid') if isinstance(student, dict) else getattr(student, 'rfid_uid', 'Unknown')}")
 
+    def set_student(self, student):
+        """
+        Set the current student and cache their ID for MQTT callback filtering.
+
+        Args:
+            student: Student object or student data dictionary
+        """
+        self.student = student
+        if isinstance(student, dict):
+            self._student_id = student.get('id')
+        else:
+            self._student_id = getattr(student, 'id', None)
+
     def init_ui(self):
         """
         Initialize the dashboard UI.
         """
         # Initialize faculty card manager for pooled cards
         # 🔧 FIX: Ensure faculty card manager is initialized here
-        from ..ui.pooled_faculty_card import get_faculty_card_manager
         self.faculty_card_manager = get_faculty_card_manager()
         
         # Main layout with splitter
@@ -536,6 +620,8 @@ class DashboardWindow(BaseWindow):
 
         # Temporarily disable updates to reduce flickering and improve performance
         self.setUpdatesEnabled(False)
+        # Suspend grid relayout so adding N cards costs one layout pass instead of N
+        self.faculty_grid.setEnabled(False)
 
         try:
             # Clear existing grid efficiently using pooled cards
@@ -588,13 +674,6 @@ class DashboardWindow(BaseWindow):
                         logger.error(f"Missing required fields in faculty_data: {faculty_data}")
                         continue
 
-                    # Create a container widget to center the card
-                    container = QWidget()
-                    container.setStyleSheet("background-color: transparent;")
-                    container_layout = QHBoxLayout(container)
-                    container_layout.setContentsMargins(0, 0, 0, 0)
-                    container_layout.setAlignment(Qt.AlignCenter)
-
                     logger.debug(f"Creating card for faculty {faculty_data['name']}: available={faculty_data.get('available', False)}")
 
                     # Get pooled faculty card
@@ -608,8 +687,9 @@ class DashboardWindow(BaseWindow):
                         # Use faculty_data dictionary instead of faculty object to avoid type mismatch
                         card.consultation_requested.connect(lambda f_data=faculty_data: self.show_consultation_form_safe(f_data))
 
-                    # Add card to container
-                    container_layout.addWidget(card)
+                    # Center the card in a container, reusing the one it kept from the pool
+                    container = self._get_card_container(card)
+                    self._faculty_card_index[faculty_data['id']] = card
 
                     # Store container for batch processing
                     containers.append((container, row, col))
@@ -631,13 +711,21 @@ class DashboardWindow(BaseWindow):
             # Add all containers to the grid at once
             for container, r, c in containers:
                 self.faculty_grid.addWidget(container, r, c)
+                container.show()
+            self._faculty_loaded = bool(containers)
+            self._release_idle_card_containers()
 
             # Log successful population
             logger.info(f"Successfully populated faculty grid with {len(containers)} faculty cards")
 
         finally:
-            # Re-enable updates after all changes are made
+            # Lay the grid out once and repaint it once after all changes are made
+            self.faculty_grid.setEnabled(True)
+            self.faculty_grid.activate()
             self.setUpdatesEnabled(True)
+            grid_widget = self.faculty_grid.parentWidget()
+            if grid_widget:
+                grid_widget.update()
 
     def show_consultation_form_safe(self, faculty_data):
         """
@@ -703,6 +791,28 @@ class DashboardWindow(BaseWindow):
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
 
+    @staticmethod
+    def _to_safe_faculty_data(faculty):
+        """
+        Convert a faculty object to the safe data dictionary used by the faculty cards.
+
+        Args:
+            faculty: Faculty model instance
+
+        Returns:
+            dict: Faculty data detached from the database session
+        """
+        status = faculty.status
+        return {
+            'id': faculty.id,
+            'name': faculty.name,
+            'department': faculty.department,
+            'available': status,
+            'status': 'Available' if status else 'Unavailable',
+            'email': faculty.email,
+            'room': getattr(faculty, 'room', None)
+        }
+
     def _extract_safe_faculty_data(self, faculty_data_list):
         """
         Extract relevant data from safe faculty data for comparison.
@@ -791,13 +901,6 @@ class DashboardWindow(BaseWindow):
 
             for faculty in faculties:
                 try:
-                    # Create a container widget to center the card
-                    container = QWidget()
-                    container.setStyleSheet("background-color: transparent;")
-                    container_layout = QHBoxLayout(container)
-                    container_layout.setContentsMargins(0, 0, 0, 0)
-                    container_layout.setAlignment(Qt.AlignCenter)
-
                     # Convert faculty object to dictionary format expected by FacultyCard
                     # Access all attributes at once to avoid DetachedInstanceError
                     faculty_id = faculty.id
@@ -831,8 +934,9 @@ class DashboardWindow(BaseWindow):
                         # Use faculty_data dictionary instead of faculty object to avoid type mismatch
                         card.consultation_requested.connect(lambda f_data=faculty_data: self.show_consultation_form_safe(f_data))
 
-                    # Add card to container
-                    container_layout.addWidget(card)
+                    # Center the card in a container, reusing the one it kept from the pool
+                    container = self._get_card_container(card)
+                    self._faculty_card_index[faculty_data['id']] = card
 
                     # Store container for batch processing
                     containers.append((container, row, col))
@@ -851,6 +955,9 @@ class DashboardWindow(BaseWindow):
             # Now add all containers to the grid at once
             for container, r, c in containers:
                 self.faculty_grid.addWidget(container, r, c)
+                container.show()
+            self._faculty_loaded = bool(containers)
+            self._release_idle_card_containers()
 
             # Log successful population
             logger.info(f"Successfully populated faculty grid with {len(containers)} faculty cards")
@@ -1095,18 +1202,7 @@ class DashboardWindow(BaseWindow):
             faculties = faculty_controller.get_all_faculty()
             
             # Convert to safe faculty data format
-            safe_faculties = []
-            for faculty in faculties:
-                faculty_data = {
-                    'id': faculty.id,
-                    'name': faculty.name,
-                    'department': faculty.department,
-                    'available': faculty.status,
-                    'status': 'Available' if faculty.status else 'Unavailable',
-                    'email': faculty.email,
-                    'room': getattr(faculty, 'room', None)
-                }
-                safe_faculties.append(faculty_data)
+            safe_faculties = [self._to_safe_faculty_data(faculty) for faculty in faculties]
             
             # Apply filters
             if filter_text:
@@ -1131,10 +1227,12 @@ class DashboardWindow(BaseWindow):
         
         # Check if minimum interval has passed since last refresh
         if current_time - self._last_refresh_time < self._min_refresh_interval:
-            logger.info(f"⏱️ [THROTTLE] Skipping refresh - only {current_time - self._last_refresh_time:.1f}s since last refresh (min: {self._min_refresh_interval}s)")
+            logger.info("[THROTTLE] Skipping refresh - only %.1fs since last refresh (min: %ss)",
+                        current_time - self._last_refresh_time, self._min_refresh_interval)
             return
         
-        logger.info(f"🔄 [THROTTLE] Proceeding with throttled refresh - {current_time - self._last_refresh_time:.1f}s since last refresh")
+        logger.info("[THROTTLE] Proceeding with throttled refresh - %.1fs since last refresh",
+                    current_time - self._last_refresh_time)
         self._last_refresh_time = current_time
         self.refresh_faculty_status()
 
@@ -1143,9 +1241,6 @@ class DashboardWindow(BaseWindow):
         Refresh faculty status with improved error handling and caching.
         """
         try:
-            # Import faculty controller
-            from ..controllers.faculty_controller import get_faculty_controller
-
             # Get the global faculty controller instance
             faculty_controller = get_faculty_controller()
 
@@ -1153,18 +1248,7 @@ class DashboardWindow(BaseWindow):
             faculties = faculty_controller.get_all_faculty()
 
             # Convert to safe faculty data format
-            safe_faculties = []
-            for faculty in faculties:
-                faculty_data = {
-                    'id': faculty.id,
-                    'name': faculty.name,
-                    'department': faculty.department,
-                    'available': faculty.status,
-                    'status': 'Available' if faculty.status else 'Unavailable',
-                    'email': faculty.email,
-                    'room': getattr(faculty, 'room', None)
-                }
-                safe_faculties.append(faculty_data)
+            safe_faculties = [self._to_safe_faculty_data(faculty) for faculty in faculties]
 
             # Check if data has changed before updating
             new_hash = self._extract_safe_faculty_data(safe_faculties)
@@ -1180,7 +1264,7 @@ class DashboardWindow(BaseWindow):
             self._last_faculty_hash = new_hash
 
             # Also update the consultation panel with the latest faculty options (convert back to objects)
-            if hasattr(self, 'consultation_panel'):
+            if self.consultation_panel is not None:
                 self.consultation_panel.set_faculty_options(faculties)
                 logger.debug("Refreshed consultation panel faculty options in refresh_faculty_status")
 
@@ -1254,7 +1338,6 @@ class DashboardWindow(BaseWindow):
             logger.info(f"show_consultation_form received faculty ID: {faculty_or_id}. Fetching object.")
             try:
                 # 🔧 FIX: Use global Faculty Controller instead of creating new instance
-                from ..controllers.faculty_controller import get_faculty_controller
                 fc = get_faculty_controller()  # Use global controller with real-time updates
                 faculty_object = fc.get_faculty_by_id(faculty_or_id)
                 if not faculty_object:
@@ -1290,7 +1373,6 @@ class DashboardWindow(BaseWindow):
         # Also populate the dropdown with all available faculty
         try:
             # 🔧 FIX: Use get_faculty_controller()
-            from ..controllers.faculty_controller import get_faculty_controller # Local import
             faculty_controller = get_faculty_controller()
             available_faculty = faculty_controller.get_all_faculty(filter_available=True)
 
@@ -1480,7 +1562,7 @@ class DashboardWindow(BaseWindow):
             # Start monitoring when dashboard is shown
             self.inactivity_monitor.start_monitoring()
             
-            logger.info("✅ Inactivity monitor set up for student dashboard - 2 minute timeout with 30 second warning")
+            logger.info("Inactivity monitor set up for student dashboard - 2 minute timeout with 30 second warning")
             
         except Exception as e:
             logger.error(f"Error setting up inactivity monitor: {e}")
@@ -1544,45 +1626,18 @@ class DashboardWindow(BaseWindow):
             message (str): Message to display
             message_type (str): Type of message ('success', 'error', 'warning', or 'info')
         """
-        try:
-            # Import notification manager
-            from ..utils.notification import NotificationManager
-
-            # Map message types
-            type_mapping = {
-                "success": NotificationManager.SUCCESS,
-                "error": NotificationManager.ERROR,
-                "warning": NotificationManager.WARNING,
-                "info": NotificationManager.INFO
-            }
-
-            # Get standardized message type
-            std_type = type_mapping.get(message_type.lower(), NotificationManager.INFO)
-
-            # Show notification using the manager
-            title = message_type.capitalize()
-            if message_type == "error":
-                title = "Error"
-            elif message_type == "success":
-                title = "Success"
-            elif message_type == "warning":
-                title = "Warning"
-            else:
-                title = "Information"
+        title, std_type = _MESSAGE_TYPE_NOTIFICATIONS.get(message_type.lower(), _DEFAULT_MESSAGE_TYPE_NOTIFICATION)
 
-            NotificationManager.show_message(self, title, message, std_type)
-
-        except ImportError:
+        if NotificationManager is None:
             # Fallback to basic message boxes if notification manager is not available
             logger.warning("NotificationManager not available, using basic message boxes")
-            if message_type == "success":
-                QMessageBox.information(self, "Success", message)
-            elif message_type == "error":
-                QMessageBox.warning(self, "Error", message)
-            elif message_type == "warning":
-                QMessageBox.warning(self, "Warning", message)
+            if std_type in _WARNING_NOTIFICATION_TYPES:
+                QMessageBox.warning(self, title, message)
             else:
-                QMessageBox.information(self, "Information", message)
+                QMessageBox.information(self, title, message)
+            return
+
+        NotificationManager.show_message(self, title, message, getattr(NotificationManager, std_type))
 
     def _scroll_faculty_to_top(self):
         """
@@ -1598,27 +1653,68 @@ class DashboardWindow(BaseWindow):
         Clear the faculty grid using pooled cards with proper null checks.
         """
         try:
-            # Check if faculty_card_manager is initialized
-            if self.faculty_card_manager is not None:
-                self.faculty_card_manager.clear_all_cards()
-                logger.debug("Cleared all faculty cards using pooled manager")
-            else:
-                logger.warning("Faculty card manager not initialized, skipping card cleanup")
-                
-            # Clear the grid layout if it exists
-            if hasattr(self, 'faculty_grid') and self.faculty_grid is not None:
-                # Clear all widgets from the grid
-                while self.faculty_grid.count():
-                    item = self.faculty_grid.takeAt(0)
-                    if item.widget():
-                        item.widget().deleteLater()
-                logger.debug("Cleared faculty grid layout")
-            else:
+            if not hasattr(self, 'faculty_grid') or self.faculty_grid is None:
                 logger.warning("Faculty grid not initialized, skipping grid cleanup")
+            elif self.faculty_card_manager is None:
+                logger.warning("Faculty card manager not initialized, clearing grid without pooling")
+                # Take items from the end so Qt doesn't shift the item list on every removal
+                for i in range(self.faculty_grid.count() - 1, -1, -1):
+                    widget = self.faculty_grid.takeAt(i).widget()
+                    if widget:
+                        widget.deleteLater()
+            else:
+                # Return cards to the pool while they stay inside their hidden containers
+                for widget in self.faculty_card_manager.detach_all_from_layout(self.faculty_grid):
+                    if widget.objectName() == "faculty_card_container":
+                        self._idle_card_containers.add(widget)
+                    else:
+                        # Loading, empty-state and error widgets are not reused
+                        widget.deleteLater()
+                logger.debug("Cleared faculty grid layout using pooled manager")
+
+            self._faculty_card_index = {}
+            self._faculty_loaded = False
                 
         except Exception as e:
             logger.error(f"Error clearing faculty grid: {e}")
 
+    def _get_card_container(self, card):
+        """
+        Get the centering container for a faculty card.
+
+        A pooled card released by _clear_faculty_grid_pooled is still inside its old
+        container, which is reused as-is; otherwise a new container is created.
+
+        Args:
+            card: Faculty card widget
+
+        Returns:
+            QWidget: Container holding the card
+        """
+        container = card.parentWidget()
+        if container is not None and container in self._idle_card_containers:
+            self._idle_card_containers.discard(container)
+            return container
+
+        container = QWidget()
+        container.setObjectName("faculty_card_container")
+        container.setStyleSheet("background-color: transparent;")
+        container_layout = QHBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        container_layout.setAlignment(Qt.AlignCenter)
+        container_layout.addWidget(card)
+        return container
+
+    def _release_idle_card_containers(self):
+        """
+        Delete idle containers whose pooled card was handed to another container or destroyed.
+        """
+        for container in list(self._idle_card_containers):
+            layout = container.layout()
+            if layout is None or layout.count() == 0:
+                self._idle_card_containers.discard(container)
+                container.deleteLater()
+
     def showEvent(self, event):
         """
         Handle show event with initial faculty data loading.
@@ -1631,34 +1727,49 @@ class DashboardWindow(BaseWindow):
         logger.info("Dashboard window shown - triggering initial faculty data load")
         
         # 🔧 FIX: Delay initial faculty load to prevent overriding real-time updates
-        # Real-time MQTT messages might arrive during dashboard initialization
-        # Give them time to process and update the database before loading from DB
-        from PyQt5.QtCore import QTimer
-        QTimer.singleShot(100, self._perform_initial_faculty_load)  # 100ms delay
+        # Real-time MQTT messages might arrive during dashboard initialization,
+        # so the DB load waits until no status message has arrived for a short window
+        self._arm_initial_faculty_load()
+
+    def _arm_initial_faculty_load(self):
+        """
+        Schedule the initial faculty load for the next quiet MQTT window.
+        """
+        self._initial_load_armed = True
+        if not self._initial_load_timer.isActive():
+            self._initial_load_timer.start(0)
+
+    def _check_initial_faculty_load(self):
+        """
+        Run the initial faculty load if MQTT status traffic has gone quiet, otherwise check again later.
+        """
+        if not self._initial_load_armed:
+            return
+
+        remaining = self._mqtt_quiet_window - (time.monotonic() - self._last_mqtt_arrival)
+        if remaining > 0:
+            self._initial_load_timer.start(int(remaining * 1000) + 1)
+            return
+
+        self._initial_load_armed = False
+        self._perform_initial_faculty_load()
 
     def _perform_initial_faculty_load(self):
         """
         Perform the initial load of faculty data.
         """
-        try:
-            from ..controllers.faculty_controller import get_faculty_controller
+        # Cards already in the grid are kept current by the MQTT status stream
+        if self._faculty_loaded and self._faculty_card_index:
+            logger.info("Faculty already populated, skipping initial DB load")
+            self._hide_loading_indicator()
+            return
 
+        try:
             faculty_controller = get_faculty_controller()
             faculties = faculty_controller.get_all_faculty()
 
             # Convert to safe faculty data format
-            safe_faculties = []
-            for faculty in faculties:
-                faculty_data = {
-                    'id': faculty.id,
-                    'name': faculty.name,
-                    'department': faculty.department,
-                    'available': faculty.status,
-                    'status': 'Available' if faculty.status else 'Unavailable',
-                    'email': faculty.email,
-                    'room': getattr(faculty, 'room', None)
-                }
-                safe_faculties.append(faculty_data)
+            safe_faculties = [self._to_safe_faculty_data(faculty) for faculty in faculties]
 
             if safe_faculties:
                 self.populate_faculty_grid_safe(safe_faculties)
@@ -1666,7 +1777,7 @@ class DashboardWindow(BaseWindow):
                 self._last_faculty_hash = self._extract_safe_faculty_data(safe_faculties)
                 
                 # Update consultation panel options with object versions
-                if hasattr(self, 'consultation_panel'):
+                if self.consultation_panel is not None:
                     self.consultation_panel.set_faculty_options(faculties)
             else:
                 self._show_empty_faculty_message()
@@ -1682,12 +1793,12 @@ class DashboardWindow(BaseWindow):
         Handle window close event with proper cleanup.
         """
         # Stop inactivity monitoring
-        if hasattr(self, 'inactivity_monitor') and self.inactivity_monitor and self.inactivity_monitor.is_monitoring():
+        if self.inactivity_monitor is not None and self.inactivity_monitor.is_monitoring():
             self.inactivity_monitor.stop_monitoring()
             logger.info("Stopped inactivity monitoring on window close")
 
         # Clean up faculty card manager
-        if hasattr(self, 'faculty_card_manager'):
+        if self.faculty_card_manager is not None:
             self.faculty_card_manager.clear_all_cards()
 
         # Save splitter state before closing
@@ -1702,26 +1813,43 @@ class DashboardWindow(BaseWindow):
     def setup_realtime_updates(self):
         """Set up real-time MQTT subscriptions for faculty status updates."""
         try:
-            from ..utils.mqtt_utils import subscribe_to_topic
-            from ..utils.mqtt_topics import MQTTTopics
-            
+            # Both subscriptions share one callback that dispatches on the topic's last level
+            self._mqtt_dispatch = {
+                'status_update': self.handle_realtime_status_update,
+                'notifications': self.handle_system_notification,
+            }
+
             # Subscribe to faculty status updates from central system (processed updates)
-            subscribe_to_topic("consultease/faculty/+/status_update", self.handle_realtime_status_update)
+            subscribe_to_topic("consultease/faculty/+/status_update", self._on_mqtt_message)
             
             # NOTE: Removed subscription to raw ESP32 messages to prevent duplicate processing
             # The Faculty Controller handles raw ESP32 messages and publishes processed notifications
             # Dashboard should only receive processed notifications, not raw ESP32 data
             
             # Subscribe to system notifications
-            subscribe_to_topic(MQTTTopics.SYSTEM_NOTIFICATIONS, self.handle_system_notification)
+            subscribe_to_topic(MQTTTopics.SYSTEM_NOTIFICATIONS, self._on_mqtt_message)
             
-            logger.info("✅ Real-time faculty status updates enabled (processed notifications only)")
-            logger.info("   📡 Subscribed to: consultease/faculty/+/status_update")
-            logger.info("   📡 Subscribed to: consultease/system/notifications")
-            logger.info("   🚫 NOT subscribed to raw ESP32 messages (handled by Faculty Controller)")
+            logger.info("Real-time faculty status updates enabled (processed notifications only)")
+            logger.info("   Subscribed to: consultease/faculty/+/status_update")
+            logger.info("   Subscribed to: consultease/system/notifications")
+            logger.info("   NOT subscribed to raw ESP32 messages (handled by Faculty Controller)")
         except Exception as e:
             logger.error(f"Failed to set up real-time updates: {e}")
 
+    def _on_mqtt_message(self, topic, data):
+        """
+        Route a dashboard MQTT message to its handler by the topic's last level.
+
+        Args:
+            topic (str): MQTT topic
+            data (dict): Decoded message payload
+        """
+        handler = self._mqtt_dispatch.get(topic.rsplit('/', 1)[-1])
+        if handler is None:
+            logger.debug("No dashboard handler for MQTT topic %s", topic)
+            return
+        handler(topic, data)
+
     def cleanup_realtime_updates(self):
         """Clean up MQTT subscriptions on window close."""
         try:
@@ -1740,62 +1868,46 @@ class DashboardWindow(BaseWindow):
             data (dict): Status update data
         """
         try:
-            logger.info(f"[MQTT DASHBOARD HANDLER] handle_realtime_status_update - Topic: {topic}, Data: {data}")
-            logger.debug(f"Received real-time faculty status update: {data}")
+            logger.debug("[MQTT DASHBOARD HANDLER] handle_realtime_status_update - Topic: %s, Data: %s", topic, data)
             
-            # 🔧 CRITICAL FIX: Call processing function directly instead of using QTimer
-            # The MQTT handler is already called on the main thread, so no need for QTimer
-            logger.info(f"🔄 [REALTIME] Processing status update DIRECTLY...")
-            
-            try:
-                logger.info(f"🔄 [REALTIME] Calling _process_status_update_safe directly with data: {data}")
-                self._process_status_update_safe(data)
-                logger.info(f"✅ [REALTIME] Direct processing completed successfully")
-            except Exception as direct_e:
-                logger.error(f"❌ [REALTIME] Error in direct processing: {direct_e}")
-                import traceback
-                logger.error(f"❌ [REALTIME] Direct processing traceback: {traceback.format_exc()}")
+            # Called on the MQTT worker thread: normalize the payload here and hand
+            # the result to the GUI thread through the queued status_event signal
+            self._process_status_update_safe(data)
             
         except Exception as e:
-            logger.error(f"❌ [REALTIME] Error handling real-time status update: {e}")
-            import traceback
-            logger.error(f"❌ [REALTIME] Handler traceback: {traceback.format_exc()}")
+            logger.exception("[REALTIME] Error handling real-time status update: %s", e)
 
     def _process_status_update_safe(self, data):
         """
-        Process faculty status update safely on the main thread.
+        Normalize a faculty status update on the MQTT thread and queue it for the GUI.
         
         Args:
             data (dict): Status update data
         """
         try:
-            logger.info(f"🔄 [PROCESS_SAFE] Starting status update processing for data: {data}")
+            logger.debug("[PROCESS_SAFE] Starting status update processing for data: %s", data)
             
             # Check if faculty card manager is initialized
-            if not hasattr(self, 'faculty_card_manager') or self.faculty_card_manager is None:
-                logger.error(f"❌ [PROCESS_SAFE] Faculty card manager not initialized!")
+            if self.faculty_card_manager is None:
+                logger.error("[PROCESS_SAFE] Faculty card manager not initialized!")
                 return
                 
             # Check if faculty grid is initialized  
             if not hasattr(self, 'faculty_grid') or self.faculty_grid is None:
-                logger.error(f"❌ [PROCESS_SAFE] Faculty grid not initialized!")
+                logger.error("[PROCESS_SAFE] Faculty grid not initialized!")
                 return
-                
-            logger.info(f"✅ [PROCESS_SAFE] Faculty card manager and grid are initialized")
             
             # Process only standardized status update notifications (not raw ESP32 messages)
             faculty_id = data.get('faculty_id')
             new_status = data.get('status')
             
-            logger.info(f"🔍 [PROCESS_SAFE] Extracted: faculty_id={faculty_id}, new_status={new_status} (type: {type(new_status)})")
-            
             # Check if this is a properly formatted status update notification
             if data.get('type') == 'faculty_status':
                 # This is a processed notification from Faculty Controller
-                logger.info(f"✅ [PROCESS_SAFE] Processing faculty status notification: Faculty {faculty_id} -> {new_status}")
+                logger.debug("[PROCESS_SAFE] Processing faculty status notification: Faculty %s -> %r", faculty_id, new_status)
             else:
                 # Handle legacy or non-standard formats for backward compatibility
-                logger.info(f"⚠️ [PROCESS_SAFE] Processing legacy status update format: {data}")
+                logger.debug("[PROCESS_SAFE] Processing legacy status update format: %s", data)
                 
                 # Handle string status values for backward compatibility
                 if isinstance(new_status, str):
@@ -1807,34 +1919,18 @@ class DashboardWindow(BaseWindow):
                     elif "BUSY" in status_str:
                         new_status = "busy"
                     else:
-                        logger.warning(f"❌ [PROCESS_SAFE] Unknown status string: {new_status}")
+                        logger.warning("[PROCESS_SAFE] Unknown status string: %s", new_status)
                         return
             
             if faculty_id is None or new_status is None:
-                logger.error(f"❌ [PROCESS_SAFE] Invalid faculty status update: faculty_id={faculty_id}, new_status={new_status}")
+                logger.error("[PROCESS_SAFE] Invalid faculty status update: faculty_id=%s, new_status=%s", faculty_id, new_status)
                 return
-                
-            logger.info(f"🎯 [PROCESS_SAFE] Processing dashboard status update: Faculty {faculty_id} -> {new_status}")
-                
-            # 🔧 FIX: Direct immediate update without additional QTimer
-            logger.info(f"🔄 [PROCESS_SAFE] Calling update_faculty_card_status directly...")
             
-            # Find and update the corresponding faculty card immediately
-            card_updated = self.update_faculty_card_status(faculty_id, new_status)
-
-            # Log the result for debugging
-            if card_updated:
-                logger.info(f"✅ [PROCESS_SAFE] Faculty card for ID {faculty_id} updated successfully!")
-            else:
-                logger.warning(f"❌ [PROCESS_SAFE] Faculty card for ID {faculty_id} not found in current view")
-                logger.info(f"🔄 [PROCESS_SAFE] Triggering full UI refresh as fallback...")
-                # Try a quick refresh if card not found
-                self.request_ui_refresh.emit()
+            # Queue the card update (deduplicated against the system notification path)
+            self._enqueue_status(faculty_id, new_status)
             
         except Exception as e:
-            logger.error(f"❌ [PROCESS_SAFE] Error processing status update safely: {e}")
-            import traceback
-            logger.error(f"❌ [PROCESS_SAFE] Traceback: {traceback.format_exc()}")
+            logger.exception("[PROCESS_SAFE] Error processing status update safely: %s", e)
 
     def handle_system_notification(self, topic, data):
         """
@@ -1845,29 +1941,18 @@ class DashboardWindow(BaseWindow):
             data (dict): Notification data
         """
         try:
-            logger.info(f"[MQTT DASHBOARD HANDLER] handle_system_notification - Topic: {topic}, Data: {data}")
+            logger.debug("[MQTT DASHBOARD HANDLER] handle_system_notification - Topic: %s, Data: %s", topic, data)
             
-            # 🔧 CRITICAL FIX: Call processing function directly instead of using QTimer
-            # The MQTT handler is already called on the main thread, so no need for QTimer
-            logger.info(f"🔄 [SYSTEM_NOTIF] Processing system notification DIRECTLY...")
-            
-            try:
-                logger.info(f"🔄 [SYSTEM_NOTIF] Calling _process_system_notification_safe directly with data: {data}")
-                self._process_system_notification_safe(data)
-                logger.info(f"✅ [SYSTEM_NOTIF] Direct processing completed successfully")
-            except Exception as direct_e:
-                logger.error(f"❌ [SYSTEM_NOTIF] Error in direct processing: {direct_e}")
-                import traceback
-                logger.error(f"❌ [SYSTEM_NOTIF] Direct processing traceback: {traceback.format_exc()}")
+            # Called on the MQTT worker thread: normalize the payload here and hand
+            # the result to the GUI thread through the queued status_event signal
+            self._process_system_notification_safe(data)
             
         except Exception as e:
-            logger.error(f"❌ [SYSTEM_NOTIF] Error handling system notification: {e}")
-            import traceback
-            logger.error(f"❌ [SYSTEM_NOTIF] Handler traceback: {traceback.format_exc()}")
+            logger.exception("[SYSTEM_NOTIF] Error handling system notification: %s", e)
 
     def _process_system_notification_safe(self, data):
         """
-        Process system notification safely on the main thread.
+        Normalize a system notification on the MQTT thread and queue any status change for the GUI.
         
         Args:
             data (dict): Notification data
@@ -1878,30 +1963,10 @@ class DashboardWindow(BaseWindow):
                 faculty_id = data.get('faculty_id')
                 new_status = data.get('status')
                 
-                logger.info(f"🎯 [DASHBOARD] Processing faculty_status notification: Faculty {faculty_id}, Status: {new_status} (type: {type(new_status)})")
+                logger.debug("[DASHBOARD] Processing faculty_status notification: Faculty %s, Status: %r", faculty_id, new_status)
                 
                 if faculty_id is not None and new_status is not None:
-                    # 🔧 FIX: Proper status mapping with detailed logging
-                    converted_status = self._map_status_for_display(new_status)
-                    logger.info(f"🎯 [DASHBOARD] Status conversion: {new_status} -> {converted_status}")
-                    
-                    # 🔧 FIX: Immediate system notification update
-                    from PyQt5.QtCore import QTimer
-                    
-                    def immediate_system_update():
-                        # Update the faculty card immediately
-                        card_updated = self.update_faculty_card_status(faculty_id, converted_status)
-                        logger.info(f"🎯 [DASHBOARD] Faculty {faculty_id} system notification update result: card_updated={card_updated}")
-                        
-                        # System notifications should also update immediately
-                        if not card_updated:
-                            logger.info(f"🔄 [DASHBOARD] Faculty card for ID {faculty_id} not visible, triggering refresh")
-                            self.request_ui_refresh.emit()
-                        else:
-                            logger.info(f"✅ [DASHBOARD] Faculty card for ID {faculty_id} updated via system notification")
-                    
-                    # Immediate update for system notifications too
-                    QTimer.singleShot(0, immediate_system_update)
+                    self._enqueue_status(faculty_id, new_status)
             
             # ✅ FIX: Handle faculty response notifications (BUSY, ACKNOWLEDGE, etc.)
             elif data.get('type') == 'faculty_response_received':
@@ -1909,34 +1974,72 @@ class DashboardWindow(BaseWindow):
                 response_type = data.get('response_type')
                 new_status = data.get('new_status')
                 
-                logger.info(f"🔧 [DASHBOARD] Processing faculty response: Faculty {faculty_id}, Response: {response_type}, Status: {new_status}")
+                logger.debug("[DASHBOARD] Processing faculty response: Faculty %s, Response: %s, Status: %r", faculty_id, response_type, new_status)
                 
                 if faculty_id is not None and new_status is not None:
-                    # 🔧 FIX: Use proper status mapping for faculty responses
-                    display_status = self._map_status_for_display(new_status)
-                    logger.info(f"🔧 [DASHBOARD] Faculty response status conversion: {new_status} -> {display_status}")
-                    
-                    # Immediate faculty response updates too
-                    from PyQt5.QtCore import QTimer
-                    
-                    def immediate_response_update():
-                        # Update the faculty card immediately
-                        card_updated = self.update_faculty_card_status(faculty_id, display_status)
-                        logger.info(f"🔧 [DASHBOARD] Faculty response notification for faculty {faculty_id} processed, card_updated: {card_updated}")
-                        
-                        if not card_updated:
-                            logger.info(f"🔄 [DASHBOARD] Faculty card for ID {faculty_id} not found, triggering full refresh")
-                            self.request_ui_refresh.emit()
-                        else:
-                            logger.info(f"✅ [DASHBOARD] Faculty card for ID {faculty_id} updated via response notification")
-                    
-                    # Immediate update for faculty response updates
-                    QTimer.singleShot(0, immediate_response_update)
+                    self._enqueue_status(faculty_id, new_status)
                         
         except Exception as e:
-            logger.error(f"Error processing system notification safely: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error processing system notification safely: %s", e)
+
+    def _enqueue_status(self, faculty_id, status):
+        """
+        Normalize a faculty status change and hand it to the GUI thread.
+
+        The status_update topic and the system notification topic usually deliver
+        the same change, so a repeat of the last applied (faculty_id, status) within
+        the dedup window is dropped. Safe to call from the MQTT worker threads.
+
+        Args:
+            faculty_id (int): Faculty ID
+            status: Status in any format accepted by _map_status_for_display
+        """
+        try:
+            faculty_id = int(faculty_id)
+        except (TypeError, ValueError):
+            logger.warning("[DASHBOARD] Ignoring status update with invalid faculty_id: %r", faculty_id)
+            return
+
+        display_status = self._map_status_for_display(status)
+        now = time.monotonic()
+        self._last_mqtt_arrival = now
+
+        with self._status_lock:
+            previous = self._last_applied_status.get(faculty_id)
+            if previous and previous[0] == display_status and now - previous[1] < self._status_dedup_window:
+                logger.debug("[DASHBOARD] Dropping duplicate status for faculty %s: %s", faculty_id, display_status)
+                return
+            self._last_applied_status[faculty_id] = (display_status, now)
+
+        self.status_event.emit(faculty_id, display_status)
+
+    def _apply_status_event(self, faculty_id, display_status):
+        """
+        Queue a normalized status change for the next coalesced UI pass (GUI thread).
+
+        Args:
+            faculty_id (int): Faculty ID
+            display_status (str): 'available', 'busy' or 'offline'
+        """
+        self._pending_status_updates[faculty_id] = display_status
+        if not self._status_flush_timer.isActive():
+            self._status_flush_timer.start()
+
+    def _flush_status_updates(self):
+        """
+        Apply all queued faculty status changes in a single pass.
+        """
+        pending = self._pending_status_updates
+        self._pending_status_updates = {}
+
+        refresh_needed = False
+        for faculty_id, display_status in pending.items():
+            if not self.update_faculty_card_status(faculty_id, display_status):
+                refresh_needed = True
+
+        if refresh_needed:
+            logger.info("[DASHBOARD] Faculty card not found in current view, triggering full refresh")
+            self.request_ui_refresh.emit()
 
     def _map_status_for_display(self, status):
         """
@@ -1948,8 +2051,6 @@ class DashboardWindow(BaseWindow):
         Returns:
             str: Standardized status ('available', 'busy', 'offline')
         """
-        logger.info(f"🔄 [STATUS MAPPING] Input: {status} (type: {type(status)})")
-        
         # Handle boolean status (from ESP32/Faculty Controller)
         if status is True or status == True:
             result = 'available'
@@ -1965,13 +2066,13 @@ class DashboardWindow(BaseWindow):
             elif status_lower in ['offline', 'away', 'unavailable', 'absent']:
                 result = 'offline'
             else:
-                logger.warning(f"🔄 [STATUS MAPPING] Unknown string status: '{status}', defaulting to offline")
+                logger.warning("[STATUS MAPPING] Unknown string status: '%s', defaulting to offline", status)
                 result = 'offline'
         else:
-            logger.warning(f"🔄 [STATUS MAPPING] Unknown status type: {type(status)}, defaulting to offline")
+            logger.warning("[STATUS MAPPING] Unknown status type: %s, defaulting to offline", type(status))
             result = 'offline'
         
-        logger.info(f"🔄 [STATUS MAPPING] Output: {result}")
+        logger.debug("[STATUS MAPPING] %r -> %s", status, result)
         return result
 
     def update_faculty_card_status(self, faculty_id, new_status):
@@ -1980,126 +2081,87 @@ class DashboardWindow(BaseWindow):
         
         Args:
             faculty_id (int): Faculty ID
-            new_status (bool|str): New status (True = Available, False = Unavailable, "busy" = Busy)
+            new_status (bool|str): New status (True/"available", False/"offline", or "busy")
         """
         try:
-            logger.info(f"🔍 [UI UPDATE] ===== STARTING FACULTY CARD UPDATE =====")
-            logger.info(f"🔍 [UI UPDATE] Target: faculty_id={faculty_id}, new_status={new_status} (type: {type(new_status)})")
+            # Capture once so the per-item search loop skips debug formatting entirely
+            _DBG = logger.isEnabledFor(logging.DEBUG)
+            if _DBG:
+                logger.debug("[UI UPDATE] Target: faculty_id=%s, new_status=%r", faculty_id, new_status)
             
             # Check if faculty grid exists and is initialized
             if not hasattr(self, 'faculty_grid') or self.faculty_grid is None:
-                logger.error(f"❌ [UI UPDATE] Faculty grid is not initialized!")
+                logger.error("[UI UPDATE] Faculty grid is not initialized!")
                 return False
                 
             # Check if faculty card manager exists
-            if not hasattr(self, 'faculty_card_manager') or self.faculty_card_manager is None:
-                logger.error(f"❌ [UI UPDATE] Faculty card manager is not initialized!")
+            if self.faculty_card_manager is None:
+                logger.error("[UI UPDATE] Faculty card manager is not initialized!")
                 return False
             
             # Normalize status to string
-            if new_status is True:
+            if new_status is True or new_status == "available":
                 status_string = "available"
                 available = True
-            elif new_status is False:
+            elif new_status is False or new_status == "offline":
                 status_string = "offline"
                 available = False
             elif new_status == "busy":
                 status_string = "busy"
                 available = False  # Busy is considered unavailable for consultation requests
             else:
-                logger.error(f"❌ [UI UPDATE] Unknown status type for faculty {faculty_id}: {new_status}")
+                logger.error("[UI UPDATE] Unknown status type for faculty %s: %r", faculty_id, new_status)
                 return False
             
-            logger.info(f"🔍 [UI UPDATE] Status mapping: {new_status} -> status_string='{status_string}', available={available}")
-            logger.info(f"🔍 [UI UPDATE] Faculty grid has {self.faculty_grid.count()} items to search")
-            
-            # Find the faculty card in the grid
-            for i in range(self.faculty_grid.count()):
-                container_widget = self.faculty_grid.itemAt(i).widget()
-                logger.debug(f"🔍 [UI UPDATE] Item {i}: container_widget = {type(container_widget).__name__ if container_widget else 'None'}")
+            # Look up the card directly instead of scanning every grid item
+            faculty_card = self._faculty_card_index.get(faculty_id)
+            if (faculty_card is not None and hasattr(faculty_card, 'update_status')
+                    and getattr(faculty_card, 'faculty_data', None)
+                    and faculty_card.faculty_data.get('id') == faculty_id):
+                # Duplicate notifications for an unchanged status need no Qt work at all
+                if getattr(faculty_card, '_last_status', None) == status_string:
+                    if _DBG:
+                        logger.debug("[UI UPDATE] Faculty %s already shows %s, skipping", faculty_id, status_string)
+                    return True
+
+                # Store old state for comparison
+                old_status = faculty_card.faculty_data.get('status', 'unknown')
                 
-                if not container_widget:
-                    continue
-                    
-                container_layout = container_widget.layout()
-                if not container_layout or container_layout.count() == 0:
-                    logger.debug(f"🔍 [UI UPDATE] Item {i}: No layout or empty layout")
-                    continue
-                    
-                faculty_card = container_layout.itemAt(0).widget()
-                logger.debug(f"🔍 [UI UPDATE] Item {i}: faculty_card = {type(faculty_card).__name__ if faculty_card else 'None'}")
-                
-                # Ensure it's a PooledFacultyCard and has the method
-                if not faculty_card:
-                    logger.debug(f"🔍 [UI UPDATE] Item {i}: No faculty_card widget")
-                    continue
-                
-                if not hasattr(faculty_card, 'update_status'):
-                    logger.debug(f"🔍 [UI UPDATE] Item {i}: Card missing update_status method")
-                    continue
-                    
-                if not hasattr(faculty_card, 'faculty_data'):
-                    logger.debug(f"🔍 [UI UPDATE] Item {i}: Card missing faculty_data attribute")
-                    continue
-                
-                if not faculty_card.faculty_data:
-                    logger.debug(f"🔍 [UI UPDATE] Item {i}: Card has None faculty_data")
-                    continue
+                # Update card's internal state and display using its own method
+                faculty_card.update_status(status_string)
                 
-                card_faculty_id = faculty_card.faculty_data.get('id')
-                logger.debug(f"🔍 [UI UPDATE] Item {i}: Card faculty_id = {card_faculty_id}, looking for {faculty_id}")
+                # Update faculty_data dictionary stored in the card
+                faculty_card.faculty_data['available'] = available
+                faculty_card.faculty_data['status'] = status_string
+
+                # Update card's objectName for theming
+                if status_string == "available":
+                    new_object_name = "faculty_card_available"
+                elif status_string == "busy":
+                    new_object_name = "faculty_card_busy"
+                else:
+                    new_object_name = "faculty_card_unavailable"
                 
-                if card_faculty_id == faculty_id:
-                    logger.info(f"🎯 [UI UPDATE] Found matching faculty card at position {i}")
-                    
-                    # Store old state for comparison
-                    old_status = faculty_card.faculty_data.get('status', 'unknown')
-                    old_available = faculty_card.faculty_data.get('available', False)
-                    
-                    # Update card's internal state and display using its own method
-                    faculty_card.update_status(status_string)
-                    logger.info(f"📝 [UI UPDATE] Called update_status({status_string}) on card (was: {old_status})")
-                    
-                    # Update faculty_data dictionary stored in the card
-                    faculty_card.faculty_data['available'] = available
-                    faculty_card.faculty_data['status'] = status_string
-                    logger.info(f"📝 [UI UPDATE] Updated faculty_data: {old_status}→{status_string}, {old_available}→{available}")
-
-                    # Update card's objectName for theming
-                    if new_status is True:
-                        new_object_name = "faculty_card_available"
-                    elif new_status == "busy":
-                        new_object_name = "faculty_card_busy"
-                    else:
-                        new_object_name = "faculty_card_unavailable"
+                old_object_name = faculty_card.objectName()
+                if old_object_name != new_object_name:
+                    faculty_card.setObjectName(new_object_name)
                     
-                    old_object_name = faculty_card.objectName()
-                    if old_object_name != new_object_name:
-                        faculty_card.setObjectName(new_object_name)
-                        logger.info(f"📝 [UI UPDATE] Changed objectName: {old_object_name} → {new_object_name}")
-                        
-                        # Force style refresh and immediate repaint
-                        faculty_card.style().unpolish(faculty_card)
-                        faculty_card.style().polish(faculty_card)
-                        faculty_card.update()
-                        faculty_card.repaint()  # Force immediate repaint
-                        logger.info(f"🎨 [UI UPDATE] Forced style refresh and repaint")
-                    else:
-                        # Still force an update even if objectName didn't change
-                        faculty_card.update()
-                        faculty_card.repaint()
-                        logger.info(f"🎨 [UI UPDATE] Forced card repaint (objectName unchanged)")
-
-                    logger.info(f"✅ [UI UPDATE] Successfully updated faculty card for ID {faculty_id}: {old_status}→{status_string}")
-                    return True # Found and updated
+                    # Re-apply the stylesheet; update() schedules the repaint
+                    faculty_card.style().unpolish(faculty_card)
+                    faculty_card.style().polish(faculty_card)
+                    if _DBG:
+                        logger.debug("[UI UPDATE] Changed objectName: %s -> %s", old_object_name, new_object_name)
+                faculty_card.update()
+                faculty_card._last_status = status_string
+
+                logger.info("[UI UPDATE] Updated faculty card for ID %s: %s -> %s", faculty_id, old_status, status_string)
+                return True # Found and updated
             
-            logger.warning(f"❌ [UI UPDATE] Faculty card for ID {faculty_id} not found in current view")
+            logger.warning("[UI UPDATE] Faculty card for ID %s not found in current view", faculty_id)
             return False # Card not found
             
         except Exception as e:
-            logger.error(f"Error updating faculty card status for ID {faculty_id}: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error updating faculty card status for ID %s: %s", faculty_id, e)
             return False
 
     def setup_real_time_updates(self):
@@ -2110,10 +2172,8 @@ class DashboardWindow(BaseWindow):
             # Prevent duplicate setup
             if hasattr(self, '_consultation_updates_setup'):
                 return
-                
-            # Import and register with faculty response controller
-            from ..controllers.faculty_response_controller import get_faculty_response_controller
             
+            # Register with faculty response controller
             self.faculty_response_controller = get_faculty_response_controller()
             self.faculty_response_controller.register_callback(self.handle_faculty_response_update)
             
@@ -2133,17 +2193,7 @@ class DashboardWindow(BaseWindow):
         try:
             # Check if this response is for the current student
             student_id = response_data.get('student_id')
-            if not student_id:
-                return
-                
-            # Get current student ID
-            current_student_id = None
-            if isinstance(self.student, dict):
-                current_student_id = self.student.get('id')
-            else:
-                current_student_id = getattr(self.student, 'id', None)
-                
-            if current_student_id != student_id:
+            if not student_id or student_id != self._student_id:
                 return  # Not for this student
                 
             # Extract response information
@@ -2154,14 +2204,27 @@ class DashboardWindow(BaseWindow):
             # Show notification to student
             self.show_consultation_status_notification(response_type, faculty_name, consultation_id)
             
-            # Refresh consultation history if panel is available
-            if self.consultation_panel:
-                self.consultation_panel.refresh_history()
+            # Refresh consultation history (coalesced with other responses in the same burst)
+            self.history_refresh_requested.emit()
                 
             logger.info(f"Processed real-time consultation update: {response_type} from {faculty_name}")
             
         except Exception as e:
-            logger.error(f"Error handling faculty response update: {str(e)}")
+            logger.exception("Error handling faculty response update: %s", e)
+
+    def _schedule_history_refresh(self):
+        """
+        Start the history refresh timer unless a refresh is already pending.
+        """
+        if not self._history_refresh_timer.isActive():
+            self._history_refresh_timer.start()
+
+    def _refresh_consultation_history(self):
+        """
+        Refresh the consultation history panel if it is available.
+        """
+        if self.consultation_panel:
+            self.consultation_panel.refresh_history()
 
     def show_consultation_status_notification(self, response_type, faculty_name, consultation_id):
         """
@@ -2173,51 +2236,25 @@ class DashboardWindow(BaseWindow):
             consultation_id (int): ID of the consultation
         """
         try:
-            # Import notification utilities
-            from ..utils.notification import NotificationManager
-            
-            # Create appropriate notification message
-            if response_type == "ACKNOWLEDGE" or response_type == "ACCEPTED":
-                title = "Consultation Accepted!"
-                message = f"{faculty_name} has accepted your consultation request."
-                notification_type = NotificationManager.SUCCESS
-            elif response_type == "BUSY" or response_type == "UNAVAILABLE":
-                title = "Faculty Busy"
-                message = f"{faculty_name} is currently busy and cannot take your consultation request."
-                notification_type = NotificationManager.WARNING
-            elif response_type == "REJECTED" or response_type == "DECLINED":
-                title = "Consultation Declined"
-                message = f"{faculty_name} has declined your consultation request."
-                notification_type = NotificationManager.ERROR
-            elif response_type == "COMPLETED":
-                title = "Consultation Completed"
-                message = f"Your consultation with {faculty_name} has been completed."
-                notification_type = NotificationManager.INFO
-            else:
-                title = "Consultation Update"
-                message = f"{faculty_name} has responded to your consultation request."
-                notification_type = NotificationManager.INFO
-            
+            title, template, notification_type = _RESPONSE_NOTIFICATIONS.get(
+                response_type, _DEFAULT_RESPONSE_NOTIFICATION)
+            message = template.format(name=faculty_name)
+
+            if NotificationManager is None:
+                # Fallback to basic message box if notification manager not available
+                if notification_type in _WARNING_NOTIFICATION_TYPES:
+                    QMessageBox.warning(self, title, message)
+                else:
+                    QMessageBox.information(self, title, message)
+                return
+
             # Show the notification
             NotificationManager.show_message(
                 self,
                 title,
                 message,
-                notification_type
+                getattr(NotificationManager, notification_type)
             )
             
-        except ImportError:
-            # Fallback to basic message box if notification manager not available
-            from PyQt5.QtWidgets import QMessageBox
-            
-            if response_type == "ACKNOWLEDGE" or response_type == "ACCEPTED":
-                QMessageBox.information(self, "Consultation Accepted", 
-                                      f"{faculty_name} has accepted your consultation request.")
-            elif response_type == "BUSY" or response_type == "UNAVAILABLE":
-                QMessageBox.warning(self, "Faculty Busy", 
-                                  f"{faculty_name} is currently busy and cannot take your consultation request.")
-            else:
-                QMessageBox.information(self, "Consultation Update", 
-                                      f"{faculty_name} has responded to your consultation request.")
         except Exception as e:
             logger.error(f"Error showing consultation status notification: {str(e)}")
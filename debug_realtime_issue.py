@@ -8,20 +8,37 @@ import sys
 import os
 import time
 import json
+import traceback
 from datetime import datetime
 
+try:
+    import orjson
+
+    def _dumps_pretty(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps_pretty(data):
+        return json.dumps(data, indent=2)
+
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def test_faculty_controller_status_flow():
-    """Test the Faculty Controller status update flow"""
+# Dashboard display status lookups used by test_dashboard_status_mapping
+_STATUS_MAP = {True: 'available', False: 'offline'}
+_STATUS_STR_MAP = {
+    **dict.fromkeys(('available', 'present', 'online', 'active'), 'available'),
+    **dict.fromkeys(('busy', 'in_consultation', 'occupied'), 'busy'),
+    **dict.fromkeys(('offline', 'away', 'unavailable', 'absent'), 'offline'),
+}
+
+def test_faculty_controller_status_flow(db):
+    """Test the Faculty Controller status update flow using the shared session"""
     print("🔍 Testing Faculty Controller Status Update Flow...")
     print("=" * 60)
     
     try:
         # Import required modules
         from central_system.controllers.faculty_controller import get_faculty_controller, set_faculty_controller, FacultyController
-        from central_system.models.base import get_db
         from central_system.models.faculty import Faculty
         
         # Test 1: Check global controller
@@ -36,17 +53,13 @@ def test_faculty_controller_status_flow():
             
         # Test 2: Check database status
         print("\n2️⃣ Testing Database Faculty Status...")
-        db = get_db()
-        try:
-            faculty = db.query(Faculty).filter(Faculty.id == 1).first()
-            if faculty:
-                print(f"✅ Faculty ID 1 found: {faculty.name}")
-                print(f"   - Status: {faculty.status}")
-                print(f"   - Last seen: {faculty.last_seen}")
-            else:
-                print("❌ Faculty ID 1 not found in database")
-        finally:
-            db.close()
+        faculty = db.get(Faculty, 1)
+        if faculty:
+            print(f"✅ Faculty ID 1 found: {faculty.name}")
+            print(f"   - Status: {faculty.status}")
+            print(f"   - Last seen: {faculty.last_seen}")
+        else:
+            print("❌ Faculty ID 1 not found in database")
             
         # Test 3: Manual status update
         print("\n3️⃣ Testing Manual Status Update...")
@@ -60,24 +73,20 @@ def test_faculty_controller_status_flow():
                 
         # Test 4: Check database after update
         print("\n4️⃣ Checking Database After Update...")
-        db = get_db()
-        try:
-            faculty = db.query(Faculty).filter(Faculty.id == 1).first()
-            if faculty:
-                print(f"✅ Faculty ID 1 status after update: {faculty.status}")
-                print(f"   - Last seen: {faculty.last_seen}")
-            else:
-                print("❌ Faculty ID 1 not found after update")
-        finally:
-            db.close()
+        # The controller wrote through its own session; reload instead of reusing the cached row
+        faculty = db.get(Faculty, 1, populate_existing=True)
+        if faculty:
+            print(f"✅ Faculty ID 1 status after update: {faculty.status}")
+            print(f"   - Last seen: {faculty.last_seen}")
+        else:
+            print("❌ Faculty ID 1 not found after update")
             
     except Exception as e:
         print(f"❌ Error in faculty controller test: {e}")
-        import traceback
         print(traceback.format_exc())
 
-def test_mqtt_message_simulation():
-    """Simulate MQTT message processing"""
+def test_mqtt_message_simulation(db):
+    """Simulate MQTT message processing using the shared session"""
     print("\n\n🔍 Testing MQTT Message Simulation...")
     print("=" * 60)
     
@@ -95,7 +104,7 @@ def test_mqtt_message_simulation():
             'change_detected': True
         }
         
-        print(f"📨 Simulating MQTT message: {json.dumps(mqtt_data, indent=2)}")
+        print(f"📨 Simulating MQTT message: {_dumps_pretty(mqtt_data)}")
         
         # Test Faculty Controller handling
         from central_system.controllers.faculty_controller import get_faculty_controller
@@ -116,26 +125,20 @@ def test_mqtt_message_simulation():
             
             # Check database after simulated update
             print("\n📊 Checking Database After Simulated MQTT...")
-            from central_system.models.base import get_db
             from central_system.models.faculty import Faculty
             
-            db = get_db()
-            try:
-                faculty = db.query(Faculty).filter(Faculty.id == 1).first()
-                if faculty:
-                    print(f"✅ Faculty status after MQTT simulation: {faculty.status}")
-                    print(f"   - Expected: {mqtt_data['status']}")
-                    print(f"   - Match: {faculty.status == mqtt_data['status']}")
-                else:
-                    print("❌ Faculty not found after MQTT simulation")
-            finally:
-                db.close()
+            faculty = db.get(Faculty, 1, populate_existing=True)
+            if faculty:
+                print(f"✅ Faculty status after MQTT simulation: {faculty.status}")
+                print(f"   - Expected: {mqtt_data['status']}")
+                print(f"   - Match: {faculty.status == mqtt_data['status']}")
+            else:
+                print("❌ Faculty not found after MQTT simulation")
         else:
             print("❌ No faculty controller available for MQTT simulation")
             
     except Exception as e:
         print(f"❌ Error in MQTT simulation: {e}")
-        import traceback
         print(traceback.format_exc())
 
 def test_dashboard_status_mapping():
@@ -149,22 +152,9 @@ def test_dashboard_status_mapping():
         
         # Mock the _map_status_for_display function
         def _map_status_for_display(status):
-            if status is True or status == True:
-                return 'available'
-            elif status is False or status == False:
-                return 'offline'
-            elif isinstance(status, str):
-                status_lower = status.lower().strip()
-                if status_lower in ['available', 'present', 'online', 'active']:
-                    return 'available'
-                elif status_lower in ['busy', 'in_consultation', 'occupied']:
-                    return 'busy'
-                elif status_lower in ['offline', 'away', 'unavailable', 'absent']:
-                    return 'offline'
-                else:
-                    return 'offline'
-            else:
-                return 'offline'
+            if isinstance(status, str):
+                return _STATUS_STR_MAP.get(status.lower().strip(), 'offline')
+            return _STATUS_MAP.get(status, 'offline')
         
         print("📊 Testing Status Mappings:")
         for status in test_statuses:
@@ -178,7 +168,6 @@ def test_dashboard_status_mapping():
         
     except Exception as e:
         print(f"❌ Error in status mapping test: {e}")
-        import traceback
         print(traceback.format_exc())
 
 def main():
@@ -187,10 +176,22 @@ def main():
     print("=" * 60)
     print(f"⏰ Started at: {datetime.now()}")
     
+    # One session shared by the database-backed tests
+    try:
+        from central_system.models.base import get_db
+        db = get_db()
+    except Exception as e:
+        print(f"❌ Could not open database session: {e}")
+        print(traceback.format_exc())
+        return
+    
     # Run all tests
-    test_faculty_controller_status_flow()
-    test_mqtt_message_simulation()
-    test_dashboard_status_mapping()
+    try:
+        test_faculty_controller_status_flow(db)
+        test_mqtt_message_simulation(db)
+        test_dashboard_status_mapping()
+    finally:
+        db.close()
     
     print("\n" + "=" * 60)
     print("🏁 Diagnostic Complete")
@@ -13,106 +13,367 @@ import os
 import time
 import json
 import logging
+import logging.handlers
+import queue
+import re
+import socket
+import threading
+from collections import deque
+from enum import IntEnum
 from datetime import datetime
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+# orjson encodes/decodes the small ESP32 payloads several times faster; fall back to json
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2)
 
 # Add central_system to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'central_system'))
 
-# Configure logging
+# Configure logging: records are only enqueued on the calling thread (including paho's
+# network thread); a listener thread formats them and writes to the console and log file
+_log_queue = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('realtime_debug.log')
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_output_handlers = [logging.StreamHandler(), logging.FileHandler('realtime_debug.log')]
+for _handler in _log_output_handlers:
+    _handler.setFormatter(_log_formatter)
+log_listener = logging.handlers.QueueListener(_log_queue, *_log_output_handlers)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
+# Topic aliases the broker may use when delivering messages to the diagnostic
+MQTT_TOPIC_ALIAS_MAXIMUM = 10
+
+# Seconds to wait for the network thread to exit after DISCONNECT
+NETWORK_THREAD_JOIN_TIMEOUT = 5
+
+# Test messages are fire-and-forget: their effect is observed on the monitoring
+# subscription, so there is no need to wait for a PUBACK per publish
+TEST_PUBLISH_QOS = 0
+
+# ESP32 status message as published by the firmware; only the %-slots vary per test
+ESP32_STATUS_PAYLOAD_TEMPLATE = (
+    b'{"faculty_id":%d,"faculty_name":"Test Faculty","present":%s,"status":"%s",'
+    b'"timestamp":%d,"ntp_sync_status":"SYNCED","in_grace_period":false,"detailed_status":"%s"}'
+)
+
+# (topic filter, QoS) pairs subscribed to for monitoring
+MONITOR_SUBSCRIPTIONS = [("consultease/#", 1)]  # All ConsultEase messages
+
+# Upper bound on captured messages kept in memory (overall and per topic group)
+MAX_CAPTURED_MESSAGES = 100_000
+
+
+class Cat(IntEnum):
+    """Topic category captured messages are tagged and bucketed with on arrival."""
+    STATUS = 0
+    STATUS_UPDATE = 1
+    RESPONSE = 2
+    UI = 3
+    SYS = 4
+    OTHER = 5
+
+
+# Topics whose messages are logged as they arrive
+LOGGED_TOPIC_RE = re.compile(r'status|response|notification')
+
+# Report labels for the message groups, in analysis order
+GROUP_LABELS = (
+    ('ESP32 Status', Cat.STATUS),
+    ('Status Updates', Cat.STATUS_UPDATE),
+    ('ESP32 Responses', Cat.RESPONSE),
+    ('UI Updates', Cat.UI),
+    ('System Notifications', Cat.SYS),
+    ('Other Messages', Cat.OTHER),
+)
+
+
+def classify_topic(topic):
+    """Return the Cat a topic belongs to."""
+    if 'status_update' in topic:
+        return Cat.STATUS_UPDATE
+    if '/status' in topic:
+        return Cat.STATUS
+    if '/responses' in topic:
+        return Cat.RESPONSE
+    if 'ui/consultation_updates' in topic:
+        return Cat.UI
+    if 'system/notifications' in topic:
+        return Cat.SYS
+    return Cat.OTHER
+
+
+# Marks a CapturedMessage whose payload has not been parsed yet
+_UNPARSED = object()
+
+
+class CapturedMessage:
+    """One message received by the diagnostic's monitoring subscription."""
+    
+    __slots__ = ('ts_ns', 'topic', 'payload', 'qos', 'cat', 'parsed')
+    
+    def __init__(self, ts_ns, topic, payload, qos, cat):
+        self.ts_ns = ts_ns  # time.monotonic_ns() at arrival
+        self.topic = topic
+        self.payload = payload  # raw bytes
+        self.qos = qos
+        self.cat = cat
+        self.parsed = _UNPARSED  # payload_json() cache
+
+
+# Offset from the monotonic clock to wall-clock time, captured once at startup
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def format_timestamp(entry):
+    """Format a captured message's monotonic receive time as a wall-clock ISO timestamp."""
+    return datetime.fromtimestamp((entry.ts_ns + _EPOCH_OFFSET_NS) / 1e9).isoformat()
+
+
+def payload_text(entry):
+    """Decode a captured message's raw payload for display."""
+    return entry.payload.decode('utf-8', errors='replace')
+
+
+def payload_json(entry):
+    """Parse a captured message's payload as JSON on first use; None if it is not JSON."""
+    if entry.parsed is _UNPARSED:
+        try:
+            entry.parsed = json_loads(entry.payload)
+        except ValueError:
+            entry.parsed = None
+    return entry.parsed
+
 class RealTimeIssueDiagnostic:
     """Comprehensive diagnostic tool for real-time update issues."""
     
     def __init__(self):
-        self.mqtt_client = mqtt.Client(client_id="RealTimeDebugger")
+        self.mqtt_client = mqtt.Client(
+            mqtt.CallbackAPIVersion.VERSION2,
+            client_id="RealTimeDebugger",
+            protocol=mqtt.MQTTv5
+        )
         self.mqtt_connected = False
-        self.received_messages = []
+        # Set by on_connect/on_connect_fail with the outcome in _connect_rc
+        self._connected_evt = threading.Event()
+        self._connect_rc = None
+        # SUBSCRIBE message ids still waiting for a SUBACK
+        self._pending_subs = set()
+        self._all_subscribed = threading.Event()
+        # Dedicated thread running the paho network loop, see _start_network_loop
+        self._network_thread = None
+        # Inbound topic aliases -> topic names; paho does not resolve aliases on delivery,
+        # so aliased PUBLISHes arrive with an empty topic and are resolved in on_message
+        self._topic_aliases = {}
+        self.received_messages = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        # Per-category captures and message counts, indexed by Cat
+        self._by_group = [deque(maxlen=MAX_CAPTURED_MESSAGES) for _ in Cat]
+        # Counts are not capped; they are signalled to the test methods waiting on them
+        self._group_counts = [0] * len(Cat)
+        self._message_cond = threading.Condition()
         self.test_faculty_id = 1  # Change this to match your test faculty
+        self._build_test_topics()
         
         # MQTT Configuration - Update with your broker details
         self.MQTT_BROKER = "192.168.100.3"  # Update with your MQTT broker IP
         self.MQTT_PORT = 1883
         
+    def _build_test_topics(self):
+        """Build the topic strings for test_faculty_id once, instead of per test publish."""
+        faculty_prefix = f"consultease/faculty/{self.test_faculty_id}/"
+        self._topic_status = faculty_prefix + "status"
+        self._topic_responses = faculty_prefix + "responses"
+        self._faculty_topic_marker = f"faculty/{self.test_faculty_id}/"
+    
+    def _messages(self, group):
+        """Return a snapshot list of the captured messages in one topic group."""
+        # list() copies the deque without yielding to the paho thread that appends to it
+        return list(self._by_group[group])
+    
+    def _message_counts(self, *groups):
+        """Return the current message counts of the given groups, for _wait_for_messages."""
+        with self._message_cond:
+            return {group: self._group_counts[group] for group in groups}
+    
+    def _wait_for_messages(self, baseline, timeout):
+        """
+        Wait until every group in baseline has received a message past its count, or timeout.
+
+        Returns:
+            bool: True if all groups received a message before the timeout
+        """
+        with self._message_cond:
+            return self._message_cond.wait_for(
+                lambda: all(self._group_counts[group] > count for group, count in baseline.items()),
+                timeout
+            )
+    
+    def clear_messages(self):
+        """Drop all captured messages."""
+        self.received_messages.clear()
+        for messages in self._by_group:
+            messages.clear()
+    
     def connect_mqtt(self):
         """Connect to MQTT broker."""
         try:
             self.mqtt_client.on_connect = self.on_connect
+            self.mqtt_client.on_connect_fail = self.on_connect_fail
             self.mqtt_client.on_message = self.on_message
-            self.mqtt_client.connect(self.MQTT_BROKER, self.MQTT_PORT, 60)
-            self.mqtt_client.loop_start()
+            self.mqtt_client.on_subscribe = self.on_subscribe
+            # Let the broker replace repeated topic strings with 2-byte aliases on delivery
+            connect_properties = Properties(PacketTypes.CONNECT)
+            connect_properties.TopicAliasMaximum = MQTT_TOPIC_ALIAS_MAXIMUM
+            self.mqtt_client.connect(self.MQTT_BROKER, self.MQTT_PORT, 60, properties=connect_properties)
+            self._start_network_loop()
+            
+            # Wait for the connection outcome; a refusal ends the wait immediately
+            if not self._connected_evt.wait(timeout=10):
+                logger.error("❌ Failed to connect to MQTT broker within timeout")
+                self._stop_network_loop()
+                return False
             
-            # Wait for connection
-            timeout = 10
-            start_time = time.time()
-            while not self.mqtt_connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
-                
             if self.mqtt_connected:
                 logger.info("✅ Connected to MQTT broker successfully")
                 return True
-            else:
-                logger.error("❌ Failed to connect to MQTT broker within timeout")
-                return False
+            
+            logger.error(f"❌ MQTT broker refused the connection: {self._connect_rc}")
+            self._stop_network_loop()
+            return False
                 
         except Exception as e:
             logger.error(f"❌ MQTT connection error: {e}")
             return False
     
-    def on_connect(self, client, userdata, flags, rc):
-        """MQTT connection callback."""
-        if rc == 0:
+    def _start_network_loop(self):
+        """
+        Drain the MQTT socket on a dedicated thread running loop_forever().
+
+        The thread only reads and writes packets and runs the callbacks, which just append to
+        the capture deques, so reply bursts are taken off the socket as soon as they arrive
+        instead of piling up in the kernel receive buffer while the main thread publishes
+        and waits. Stopped by _stop_network_loop.
+        """
+        self._network_thread = threading.Thread(
+            target=self.mqtt_client.loop_forever,
+            name="mqtt-network",
+            daemon=True
+        )
+        self._network_thread.start()
+    
+    def _stop_network_loop(self):
+        """Send DISCONNECT, which makes loop_forever() return, and wait for the network thread."""
+        self.mqtt_client.disconnect()
+        self.mqtt_connected = False
+        if self._network_thread is not None:
+            self._network_thread.join(timeout=NETWORK_THREAD_JOIN_TIMEOUT)
+            if self._network_thread.is_alive():
+                logger.warning("⚠️ MQTT network thread did not stop within %ss", NETWORK_THREAD_JOIN_TIMEOUT)
+            self._network_thread = None
+    
+    def on_connect(self, client, userdata, flags, reason_code, properties):
+        """MQTT connection callback (paho callback API version 2)."""
+        self._connect_rc = reason_code
+        if not reason_code.is_failure:
             self.mqtt_connected = True
+            # Topic aliases are scoped to a single network connection
+            self._topic_aliases.clear()
             logger.info("🔌 MQTT connected with result code 0")
+            self._tune_socket(client)
             
-            # Subscribe to all relevant topics for monitoring
-            topics = [
-                "consultease/#",  # All ConsultEase messages
-                f"consultease/faculty/{self.test_faculty_id}/status",
-                f"consultease/faculty/{self.test_faculty_id}/status_update", 
-                f"consultease/faculty/{self.test_faculty_id}/responses",
-                "consultease/ui/consultation_updates",
-                "consultease/system/notifications"
-            ]
-            
-            for topic in topics:
-                client.subscribe(topic, qos=1)
+            # Subscribe to all relevant topics for monitoring in a single SUBSCRIBE;
+            # the wildcard already covers the faculty, UI and system topics
+            self._all_subscribed.clear()
+            _rc, mid = client.subscribe(MONITOR_SUBSCRIPTIONS)
+            self._pending_subs.add(mid)
+            for topic, _qos in MONITOR_SUBSCRIPTIONS:
                 logger.info(f"📡 Subscribed to: {topic}")
         else:
-            logger.error(f"❌ MQTT connection failed with result code {rc}")
+            logger.error(f"❌ MQTT connection failed with reason code {reason_code}")
+        self._connected_evt.set()
+    
+    def on_connect_fail(self, client, userdata):
+        """MQTT callback for a failed (re)connect at the transport level."""
+        self._connect_rc = "transport connection failed"
+        self._connected_evt.set()
+    
+    def on_subscribe(self, client, userdata, mid, reason_code_list, properties):
+        """MQTT SUBACK callback; signals once every pending subscription is acknowledged."""
+        self._pending_subs.discard(mid)
+        if not self._pending_subs:
+            self._all_subscribed.set()
+    
+    def _tune_socket(self, client):
+        """
+        Send small test publishes immediately instead of waiting on Nagle's algorithm.
+
+        The socket buffer sizes are deliberately left alone: setting SO_RCVBUF/SO_SNDBUF
+        on Linux disables the kernel's buffer autotuning and is capped by net.core.rmem_max
+        (about 416 KiB after doubling on a default Pi), so a fixed size can end up smaller
+        than what autotuning would grow to under reply bursts.
+        """
+        sock = client.socket()
+        if sock is None or getattr(sock, 'family', None) not in (socket.AF_INET, socket.AF_INET6):
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not set TCP_NODELAY on MQTT socket: {e}")
     
     def on_message(self, client, userdata, msg):
         """MQTT message callback."""
         try:
             topic = msg.topic
-            payload = msg.payload.decode('utf-8')
+            # The broker may alias topics (TopicAliasMaximum in CONNECT): the first PUBLISH
+            # on a topic carries both the name and the alias, later ones only the alias
+            alias = getattr(msg.properties, 'TopicAlias', None) if msg.properties else None
+            if alias is not None:
+                if topic:
+                    self._topic_aliases[alias] = topic
+                else:
+                    topic = self._topic_aliases.get(alias, '')
+                    if not topic:
+                        logger.warning("⚠️ Received unknown MQTT topic alias %s", alias)
+            # Keep the raw bytes; payloads are only decoded when they are displayed
+            payload = msg.payload
             
             # Store message for analysis
-            message_data = {
-                'timestamp': datetime.now().isoformat(),
-                'topic': topic,
-                'payload': payload,
-                'qos': msg.qos
-            }
+            cat = classify_topic(topic)
+            message_data = CapturedMessage(time.monotonic_ns(), topic, payload, msg.qos, cat)
             
             self.received_messages.append(message_data)
+            self._by_group[cat].append(message_data)
+            with self._message_cond:
+                self._group_counts[cat] += 1
+                self._message_cond.notify_all()
             
             # Log relevant messages
-            if any(keyword in topic for keyword in ['status', 'response', 'notification']):
-                logger.info(f"📨 MQTT Message: {topic}")
-                logger.info(f"   📄 Payload: {payload}")
+            if logger.isEnabledFor(logging.INFO) and LOGGED_TOPIC_RE.search(topic):
+                logger.info("📨 MQTT Message: %s", topic)
+                logger.info("   📄 Payload: %s", payload.decode('utf-8', errors='replace'))
                 
         except Exception as e:
-            logger.error(f"❌ Error processing MQTT message: {e}")
+            logger.error("❌ Error processing MQTT message: %s", e)
     
     def test_faculty_status_updates(self):
         """Test faculty status real-time updates."""
@@ -130,41 +391,38 @@ class RealTimeIssueDiagnostic:
         for status, present, description in test_statuses:
             logger.info(f"\n🔄 Testing {status} status...")
             
-            # Create ESP32-style status message
-            esp32_message = {
-                "faculty_id": self.test_faculty_id,
-                "faculty_name": "Test Faculty",
-                "present": present,
-                "status": status,
-                "timestamp": int(time.time() * 1000),
-                "ntp_sync_status": "SYNCED",
-                "in_grace_period": False,
-                "detailed_status": status
-            }
+            # Create ESP32-style status message by filling in the pre-encoded template
+            status_bytes = status.encode()
+            payload = ESP32_STATUS_PAYLOAD_TEMPLATE % (
+                self.test_faculty_id,
+                b'true' if present else b'false',
+                status_bytes,
+                int(time.time() * 1000),
+                status_bytes
+            )
             
             # Publish to ESP32 status topic
-            topic = f"consultease/faculty/{self.test_faculty_id}/status"
-            payload = json.dumps(esp32_message)
+            topic = self._topic_status
             
-            result = self.mqtt_client.publish(topic, payload, qos=1)
+            baseline = self._message_counts(Cat.STATUS_UPDATE)
+            result = self.mqtt_client.publish(topic, payload, qos=TEST_PUBLISH_QOS)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
                 logger.info(f"✅ Published {status} status to {topic}")
-                logger.info(f"   📄 Payload: {payload}")
+                logger.info(f"   📄 Payload: {payload.decode()}")
                 
-                # Wait for processing
-                time.sleep(3)
+                # Wait for processing: return as soon as a status_update arrives (max 3s)
+                self._wait_for_messages(baseline, timeout=3)
                 
                 # Check for status_update messages
-                status_updates = [msg for msg in self.received_messages 
-                                if 'status_update' in msg['topic'] and 
-                                f"faculty/{self.test_faculty_id}" in msg['topic']]
+                status_updates = [msg for msg in self._messages(Cat.STATUS_UPDATE)
+                                  if self._faculty_topic_marker in msg.topic]
                 
                 if status_updates:
                     logger.info(f"✅ Received {len(status_updates)} status_update messages")
                     for update in status_updates[-1:]:  # Show latest
-                        logger.info(f"   📨 Topic: {update['topic']}")
-                        logger.info(f"   📄 Payload: {update['payload']}")
+                        logger.info(f"   📨 Topic: {update.topic}")
+                        logger.info(f"   📄 Payload: {payload_text(update)}")
                 else:
                     logger.warning(f"⚠️ No status_update messages received for {status}")
                     
@@ -201,24 +459,22 @@ class RealTimeIssueDiagnostic:
             }
             
             # Publish to responses topic
-            topic = f"consultease/faculty/{self.test_faculty_id}/responses"
-            payload = json.dumps(esp32_response)
+            topic = self._topic_responses
+            payload = json_dumps(esp32_response)
             
-            result = self.mqtt_client.publish(topic, payload, qos=1)
+            baseline = self._message_counts(Cat.UI, Cat.SYS)
+            result = self.mqtt_client.publish(topic, payload, qos=TEST_PUBLISH_QOS)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
                 logger.info(f"✅ Published {response_type} response to {topic}")
-                logger.info(f"   📄 Payload: {payload}")
+                logger.info(f"   📄 Payload: {payload.decode()}")
                 
-                # Wait for processing
-                time.sleep(3)
+                # Wait for processing: return once both a UI update and a notification arrive (max 3s)
+                self._wait_for_messages(baseline, timeout=3)
                 
                 # Check for UI update messages
-                ui_updates = [msg for msg in self.received_messages 
-                            if 'ui/consultation_updates' in msg['topic']]
-                
-                system_notifications = [msg for msg in self.received_messages 
-                                      if 'system/notifications' in msg['topic']]
+                ui_updates = self._messages(Cat.UI)
+                system_notifications = self._messages(Cat.SYS)
                 
                 logger.info(f"📊 Analysis for {response_type}:")
                 logger.info(f"   📱 UI Updates: {len(ui_updates)} messages")
@@ -226,11 +482,11 @@ class RealTimeIssueDiagnostic:
                 
                 if ui_updates:
                     latest_ui = ui_updates[-1]
-                    logger.info(f"   📨 Latest UI Update: {latest_ui['payload']}")
+                    logger.info(f"   📨 Latest UI Update: {payload_text(latest_ui)}")
                 
                 if system_notifications:
                     latest_notification = system_notifications[-1]
-                    logger.info(f"   📨 Latest Notification: {latest_notification['payload']}")
+                    logger.info(f"   📨 Latest Notification: {payload_text(latest_notification)}")
                     
                 if not ui_updates and not system_notifications:
                     logger.warning(f"⚠️ No UI updates or notifications received for {response_type}")
@@ -246,27 +502,21 @@ class RealTimeIssueDiagnostic:
         logger.info("🔍 ANALYZING MESSAGE FLOW")
         logger.info("="*60)
         
-        # Group messages by topic patterns
-        topic_groups = {
-            'ESP32 Status': [msg for msg in self.received_messages if '/status' in msg['topic'] and 'status_update' not in msg['topic']],
-            'Status Updates': [msg for msg in self.received_messages if 'status_update' in msg['topic']],
-            'ESP32 Responses': [msg for msg in self.received_messages if '/responses' in msg['topic']],
-            'UI Updates': [msg for msg in self.received_messages if 'ui/consultation_updates' in msg['topic']],
-            'System Notifications': [msg for msg in self.received_messages if 'system/notifications' in msg['topic']],
-            'Other Messages': [msg for msg in self.received_messages if not any(pattern in msg['topic'] for pattern in ['/status', '/responses', 'ui/', 'system/'])]
-        }
-        
-        for group_name, messages in topic_groups.items():
-            logger.info(f"\n📊 {group_name}: {len(messages)} messages")
+        # Messages were grouped by topic pattern as they arrived
+        for group_name, group in GROUP_LABELS:
+            messages = self._by_group[group]
+            count = len(messages)
+            logger.info(f"\n📊 {group_name}: {count} messages")
             
-            if messages:
-                for msg in messages[-2:]:  # Show last 2 messages
-                    logger.info(f"   📨 {msg['timestamp']}: {msg['topic']}")
-                    try:
-                        payload_json = json.loads(msg['payload'])
-                        logger.info(f"      📄 {json.dumps(payload_json, indent=6)}")
-                    except:
-                        logger.info(f"      📄 {msg['payload']}")
+            if count:
+                # Show last 2 messages; indexing a deque avoids copying the whole group
+                for msg in ((messages[-2], messages[-1]) if count >= 2 else (messages[-1],)):
+                    logger.info(f"   📨 {format_timestamp(msg)}: {msg.topic}")
+                    parsed = payload_json(msg)
+                    if parsed is not None:
+                        logger.info(f"      📄 {json_dumps_pretty(parsed)}")
+                    else:
+                        logger.info(f"      📄 {payload_text(msg)}")
     
     def provide_fix_recommendations(self):
         """Provide fix recommendations based on analysis."""
@@ -275,11 +525,11 @@ class RealTimeIssueDiagnostic:
         logger.info("="*60)
         
         # Analyze message patterns
-        status_messages = [msg for msg in self.received_messages if '/status' in msg['topic'] and 'update' not in msg['topic']]
-        status_updates = [msg for msg in self.received_messages if 'status_update' in msg['topic']]
-        response_messages = [msg for msg in self.received_messages if '/responses' in msg['topic']]
-        ui_updates = [msg for msg in self.received_messages if 'ui/consultation_updates' in msg['topic']]
-        system_notifications = [msg for msg in self.received_messages if 'system/notifications' in msg['topic']]
+        status_messages = self._by_group[Cat.STATUS]
+        status_updates = self._by_group[Cat.STATUS_UPDATE]
+        response_messages = self._by_group[Cat.RESPONSE]
+        ui_updates = self._by_group[Cat.UI]
+        system_notifications = self._by_group[Cat.SYS]
         
         logger.info("📋 ISSUE ANALYSIS:")
         
@@ -334,41 +584,50 @@ class RealTimeIssueDiagnostic:
         logger.info("🚀 Starting Comprehensive Real-Time Update Diagnostic")
         logger.info("=" * 80)
         
-        # Connect to MQTT
-        if not self.connect_mqtt():
-            logger.error("❌ Cannot proceed without MQTT connection")
-            return False
+        # test_faculty_id may have been changed since __init__
+        self._build_test_topics()
         
-        # Clear previous messages
-        self.received_messages = []
-        
-        # Wait for subscriptions to be established
-        logger.info("⏳ Waiting for MQTT subscriptions to be established...")
-        time.sleep(2)
-        
-        # Test faculty status updates
-        self.test_faculty_status_updates()
-        
-        # Test busy button responses
-        self.test_busy_button_responses()
-        
-        # Analyze message flow
-        self.analyze_message_flow()
-        
-        # Provide fix recommendations
-        self.provide_fix_recommendations()
-        
-        # Cleanup
-        self.mqtt_client.loop_stop()
-        self.mqtt_client.disconnect()
-        
-        logger.info("\n" + "="*60)
-        logger.info("✅ DIAGNOSTIC COMPLETE")
-        logger.info("="*60)
-        logger.info(f"📊 Total messages captured: {len(self.received_messages)}")
-        logger.info("📝 Check realtime_debug.log for detailed analysis")
-        
-        return True
+        try:
+            # Connect to MQTT
+            if not self.connect_mqtt():
+                logger.error("❌ Cannot proceed without MQTT connection")
+                return False
+            
+            # Clear previous messages
+            self.clear_messages()
+            
+            # Wait for subscriptions to be established
+            logger.info("⏳ Waiting for MQTT subscriptions to be established...")
+            if not self._all_subscribed.wait(timeout=5):
+                logger.warning("⚠️ MQTT subscriptions not acknowledged within 5s - continuing anyway")
+            
+            # Test faculty status updates
+            self.test_faculty_status_updates()
+            
+            # Test busy button responses
+            self.test_busy_button_responses()
+            
+            # Analyze message flow
+            self.analyze_message_flow()
+            
+            # Provide fix recommendations
+            self.provide_fix_recommendations()
+            
+            logger.info("\n" + "="*60)
+            logger.info("✅ DIAGNOSTIC COMPLETE")
+            logger.info("="*60)
+            logger.info(f"📊 Total messages captured: {len(self.received_messages)}")
+            logger.info("📝 Check realtime_debug.log for detailed analysis")
+            
+            return True
+        finally:
+            # Cleanup: send DISCONNECT while the network loop is still running, so the
+            # broker sees a clean close and paho does not attempt to reconnect
+            if self._network_thread is not None:
+                self._stop_network_loop()
+            
+            # Drain queued log records before the results are printed
+            log_listener.stop()
 
 if __name__ == "__main__":
     print("🔧 ConsultEase Real-Time Update Diagnostic Tool")
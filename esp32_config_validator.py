@@ -9,10 +9,16 @@ actual faculty ID numbers.
 
 import logging
 import json
+import re
+import signal
+import threading
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
 from pathlib import Path
-from central_system.utils.mqtt_utils import subscribe_to_topic, publish_mqtt_message
+from typing import Final
+from central_system.utils.mqtt_utils import subscribe_to_topics, publish_mqtt_message
 from central_system.models import Faculty, get_db
 from central_system.services.async_mqtt_service import get_async_mqtt_service
 
@@ -23,13 +29,158 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# orjson serializes report records several times faster and straight to bytes; fall back to json
+try:
+    import orjson
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, default=str)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, default=str).encode('utf-8')
+
+# Faculty ID segment of consultease/faculty/{id}/... and legacy faculty/{id}/... topics
+_TOPIC_RE = re.compile(r'^(?:consultease/faculty|faculty)/(\d+)(?:/|$)')
+
+# Issue types reported by the validator
+ISSUE_LITERAL_TOPIC = 'LITERAL_FACULTY_ID_IN_TOPIC'
+ISSUE_LITERAL_PAYLOAD = 'LITERAL_FACULTY_ID_IN_PAYLOAD'
+ISSUE_INVALID_TOPIC_ID = 'INVALID_FACULTY_ID_IN_TOPIC'
+ISSUE_INVALID_PAYLOAD_ID = 'INVALID_FACULTY_ID_IN_PAYLOAD'
+ISSUE_NON_NUMERIC_PAYLOAD_ID = 'NON_NUMERIC_FACULTY_ID_IN_PAYLOAD'
+ISSUE_FACULTY_ID_MISMATCH = 'FACULTY_ID_MISMATCH'
+
+# ESP32 topics monitored by the validator
+_TOPICS_TO_MONITOR: Final = (
+    "consultease/faculty/+/status",
+    "consultease/faculty/+/heartbeat",
+    "consultease/faculty/+/diagnostics",
+    "consultease/faculty/+/responses",
+    "faculty/+/status",  # Legacy format
+)
+
+# Messages buffered while the valid faculty IDs are still loading
+MAX_EARLY_MESSAGES = 1000
+
+
+class MessageRecord:
+    """One analysed ESP32 message and the configuration issues found in it."""
+    
+    __slots__ = ('timestamp_ns', 'topic', 'data', 'issues')
+    
+    def __init__(self, timestamp_ns, topic, data, issues):
+        self.timestamp_ns = timestamp_ns  # time.time_ns() at arrival
+        self.topic = topic
+        self.data = data
+        self.issues = issues
+        
+    def to_dict(self):
+        """Return the record as a JSON-serializable dict."""
+        return {
+            'timestamp': datetime.datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat(),
+            'topic': self.topic,
+            'data': self.data,
+            'issues': self.issues
+        }
+
+
+class _MessageFacts:
+    """Per-message values computed once and shared by every validation rule."""
+    
+    __slots__ = ('topic', 'topic_has_literal', 'topic_id', 'payload_fid', 'payload_id',
+                 'payload_non_numeric', 'valid_ids', 'valid_sorted')
+    
+    def __init__(self, topic, topic_has_literal, topic_id, payload_fid, payload_id,
+                 payload_non_numeric, valid_ids, valid_sorted):
+        self.topic = topic
+        self.topic_has_literal = topic_has_literal
+        self.topic_id = topic_id
+        self.payload_fid = payload_fid
+        self.payload_id = payload_id  # payload_fid parsed as int, or None
+        self.payload_non_numeric = payload_non_numeric
+        self.valid_ids = valid_ids
+        self.valid_sorted = valid_sorted
+
+
+def _payload_id_mismatch(f):
+    """Topic and payload both carry a faculty ID and they differ (numeric payload IDs compared as parsed)."""
+    payload_cmp = f.payload_id if f.payload_id is not None else f.payload_fid
+    return bool(f.topic_id and f.payload_fid and f.topic_id != payload_cmp)
+
+
+# Validation rules as (predicate, issue_builder) pairs over _MessageFacts.
+# Topic rules apply to every message; payload rules only to dict payloads.
+_TOPIC_RULES = (
+    # Literal "FACULTY_ID" in topic
+    (lambda f: f.topic_has_literal,
+     lambda f: {
+         'type': ISSUE_LITERAL_TOPIC,
+         'description': 'Topic contains literal "FACULTY_ID" instead of actual ID',
+         'topic': f.topic
+     }),
+    # Invalid faculty ID in topic
+    (lambda f: bool(f.topic_id) and f.topic_id not in f.valid_ids,
+     lambda f: {
+         'type': ISSUE_INVALID_TOPIC_ID,
+         'description': 'Faculty ID in topic not found in database',
+         'topic_faculty_id': f.topic_id,
+         'valid_ids': f.valid_sorted
+     }),
+)
+
+_PAYLOAD_RULES = (
+    # Literal "FACULTY_ID" in payload (the unexpanded macro is always upper case)
+    (lambda f: f.payload_fid == 'FACULTY_ID',
+     lambda f: {
+         'type': ISSUE_LITERAL_PAYLOAD,
+         'description': 'Payload contains literal "FACULTY_ID" instead of actual ID',
+         'payload_faculty_id': f.payload_fid
+     }),
+    # Invalid faculty ID in payload
+    (lambda f: f.payload_id is not None and f.payload_id not in f.valid_ids,
+     lambda f: {
+         'type': ISSUE_INVALID_PAYLOAD_ID,
+         'description': 'Faculty ID in payload not found in database',
+         'payload_faculty_id': f.payload_id,
+         'valid_ids': f.valid_sorted
+     }),
+    (lambda f: f.payload_non_numeric,
+     lambda f: {
+         'type': ISSUE_NON_NUMERIC_PAYLOAD_ID,
+         'description': 'Faculty ID in payload is not numeric',
+         'payload_faculty_id': f.payload_fid
+     }),
+    # Mismatch between topic and payload faculty IDs
+    (_payload_id_mismatch,
+     lambda f: {
+         'type': ISSUE_FACULTY_ID_MISMATCH,
+         'description': 'Faculty ID in topic does not match payload',
+         'topic_faculty_id': f.topic_id,
+         'payload_faculty_id': f.payload_fid
+     }),
+)
+
+
 class ESP32ConfigValidator:
     """Validator to identify and help fix ESP32 configuration issues."""
     
     def __init__(self):
-        self.received_messages = []
-        self.problematic_messages = []
-        self.valid_faculty_ids = set()
+        self.issue_counts = Counter()
+        self.total_count = 0
+        self.bad_count = 0
+        self.valid_faculty_ids = frozenset()
+        self._valid_sorted = []
+        self._stop = threading.Event()
+        
+        # Every analysed message is streamed to an NDJSON file as it arrives
+        self._report_stem = f"esp32_config_validation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._messages_filename = f"{self._report_stem}.ndjson"
+        self._messages_file = None
+        self._lock = threading.Lock()
+        
+        # Messages that arrive before the faculty IDs are loaded wait here
+        self._ids_loaded = False
+        self._early_messages = deque(maxlen=MAX_EARLY_MESSAGES)
         
     def start_validation(self, duration_minutes=5):
         """
@@ -41,168 +192,151 @@ class ESP32ConfigValidator:
         logger.info("🔧 Starting ESP32 Configuration Validation")
         logger.info(f"⏱️ Monitoring for {duration_minutes} minutes...")
         
-        # Load valid faculty IDs from database
-        self._load_valid_faculty_ids()
-        
-        # Subscribe to all faculty status topics
-        self._setup_message_monitoring()
-        
-        # Monitor for specified duration
-        start_time = time.time()
-        end_time = start_time + (duration_minutes * 60)
-        
-        logger.info("📡 Monitoring ESP32 messages...")
+        # Open the message stream before any message can arrive
+        self._messages_file = open(self._messages_filename, 'ab')
         
-        while time.time() < end_time:
-            remaining = int(end_time - time.time())
-            logger.info(f"⏳ Monitoring... {remaining} seconds remaining")
-            time.sleep(30)  # Report every 30 seconds
+        try:
+            # Load valid faculty IDs from database while subscribing to all faculty status topics
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                ids_future = executor.submit(self._load_valid_faculty_ids)
+                self._setup_message_monitoring()
+                ids_future.result()
+            self._process_early_messages()
+            
+            # Monitor for specified duration, or until stopped early (e.g. Ctrl-C)
+            end_time = time.monotonic() + (duration_minutes * 60)
+            
+            logger.info("📡 Monitoring ESP32 messages...")
             
-        # Generate report
-        self._generate_validation_report()
+            remaining = end_time - time.monotonic()
+            while remaining > 0:
+                logger.info(f"⏳ Monitoring... {int(remaining)} seconds remaining")
+                if self._stop.wait(timeout=min(30, remaining)):  # Report every 30 seconds
+                    logger.info("⏹️ Monitoring stopped early")
+                    break
+                remaining = end_time - time.monotonic()
+            
+            # Generate report
+            self._generate_validation_report()
+        finally:
+            # Flush buffered records and release the stream even if startup or the report fails
+            self._close_messages_file()
         
     def _load_valid_faculty_ids(self):
         """Load valid faculty IDs from database."""
         try:
             db = get_db()
-            faculties = db.query(Faculty).all()
-            self.valid_faculty_ids = {f.id for f in faculties}
-            logger.info(f"📚 Loaded {len(self.valid_faculty_ids)} valid faculty IDs: {sorted(self.valid_faculty_ids)}")
+            # Only the id column is needed; skip hydrating full Faculty objects
+            ids = db.query(Faculty.id).all()
+            self.valid_faculty_ids = frozenset(row[0] for row in ids)
+            self._valid_sorted = sorted(self.valid_faculty_ids)
+            logger.info(f"📚 Loaded {len(self.valid_faculty_ids)} valid faculty IDs: {self._valid_sorted}")
             db.close()
         except Exception as e:
             logger.error(f"❌ Error loading faculty IDs: {e}")
             
+    def _process_early_messages(self):
+        """Mark the faculty IDs as loaded and analyze messages buffered until then."""
+        with self._lock:
+            self._ids_loaded = True
+            early_messages = list(self._early_messages)
+            self._early_messages.clear()
+            
+        if early_messages:
+            logger.info(f"📥 Analyzing {len(early_messages)} messages received during startup")
+        for topic, data in early_messages:
+            self._analyze_message(topic, data)
+            
     def _setup_message_monitoring(self):
         """Set up MQTT message monitoring for ESP32 topics."""
         
         def message_handler(topic, data):
             """Handle incoming ESP32 messages."""
+            # Analysis needs the valid faculty IDs; hold messages until they are loaded
+            with self._lock:
+                if not self._ids_loaded:
+                    self._early_messages.append((topic, data))
+                    return
             self._analyze_message(topic, data)
             
         # Subscribe to all possible ESP32 topics
-        topics_to_monitor = [
-            "consultease/faculty/+/status",
-            "consultease/faculty/+/heartbeat", 
-            "consultease/faculty/+/diagnostics",
-            "consultease/faculty/+/responses",
-            "faculty/+/status",  # Legacy format
-        ]
-        
-        for topic in topics_to_monitor:
-            try:
-                subscribe_to_topic(topic, message_handler)
-                logger.info(f"📨 Subscribed to: {topic}")
-            except Exception as e:
-                logger.error(f"❌ Failed to subscribe to {topic}: {e}")
+        # One SUBSCRIBE packet for all filters instead of one round-trip per topic
+        if subscribe_to_topics(_TOPICS_TO_MONITOR, message_handler):
+            logger.info(f"📨 Subscribed to: {', '.join(_TOPICS_TO_MONITOR)}")
+        else:
+            logger.error(f"❌ Failed to subscribe to {_TOPICS_TO_MONITOR}")
                 
     def _analyze_message(self, topic, data):
         """Analyze incoming message for configuration issues."""
         try:
-            timestamp = datetime.datetime.now()
+            timestamp_ns = time.time_ns()
             
-            # Store all messages
-            message_record = {
-                'timestamp': timestamp,
-                'topic': topic,
-                'data': data,
-                'issues': []
-            }
+            # A topic carrying the literal placeholder has no numeric ID to extract
+            topic_has_literal = "FACULTY_ID" in topic
             
             # Extract faculty ID from topic
-            faculty_id_from_topic = self._extract_faculty_id_from_topic(topic)
-            
-            # Extract faculty ID from payload
-            faculty_id_from_payload = None
-            if isinstance(data, dict):
-                faculty_id_from_payload = data.get('faculty_id')
-            
-            # Check for issues
-            issues = []
+            faculty_id_from_topic = None if topic_has_literal else self._extract_faculty_id_from_topic(topic)
             
-            # Issue 1: Literal "FACULTY_ID" in topic
-            if "FACULTY_ID" in topic:
-                issues.append({
-                    'type': 'LITERAL_FACULTY_ID_IN_TOPIC',
-                    'description': 'Topic contains literal "FACULTY_ID" instead of actual ID',
-                    'topic': topic
-                })
-                
-            # Issue 2: Literal "FACULTY_ID" in payload
-            if isinstance(data, dict) and str(data.get('faculty_id', '')).upper() == 'FACULTY_ID':
-                issues.append({
-                    'type': 'LITERAL_FACULTY_ID_IN_PAYLOAD',
-                    'description': 'Payload contains literal "FACULTY_ID" instead of actual ID',
-                    'payload_faculty_id': data.get('faculty_id')
-                })
-                
-            # Issue 3: Invalid faculty ID in topic
-            if faculty_id_from_topic and faculty_id_from_topic not in self.valid_faculty_ids:
-                issues.append({
-                    'type': 'INVALID_FACULTY_ID_IN_TOPIC', 
-                    'description': 'Faculty ID in topic not found in database',
-                    'topic_faculty_id': faculty_id_from_topic,
-                    'valid_ids': sorted(self.valid_faculty_ids)
-                })
-                
-            # Issue 4: Invalid faculty ID in payload
+            # Extract faculty ID from payload (type check, lookup and int parse done once)
+            is_dict = isinstance(data, dict)
+            faculty_id_from_payload = data.get('faculty_id') if is_dict else None
+            payload_id = None
+            payload_non_numeric = False
             if isinstance(faculty_id_from_payload, (int, str)):
                 try:
                     payload_id = int(faculty_id_from_payload)
-                    if payload_id not in self.valid_faculty_ids:
-                        issues.append({
-                            'type': 'INVALID_FACULTY_ID_IN_PAYLOAD',
-                            'description': 'Faculty ID in payload not found in database',
-                            'payload_faculty_id': payload_id,
-                            'valid_ids': sorted(self.valid_faculty_ids)
-                        })
                 except (ValueError, TypeError):
-                    issues.append({
-                        'type': 'NON_NUMERIC_FACULTY_ID_IN_PAYLOAD',
-                        'description': 'Faculty ID in payload is not numeric',
-                        'payload_faculty_id': faculty_id_from_payload
-                    })
+                    payload_non_numeric = True
                     
-            # Issue 5: Mismatch between topic and payload faculty IDs
-            if (faculty_id_from_topic and faculty_id_from_payload and 
-                faculty_id_from_topic != faculty_id_from_payload):
-                issues.append({
-                    'type': 'FACULTY_ID_MISMATCH',
-                    'description': 'Faculty ID in topic does not match payload',
-                    'topic_faculty_id': faculty_id_from_topic,
-                    'payload_faculty_id': faculty_id_from_payload
-                })
+            facts = _MessageFacts(topic, topic_has_literal, faculty_id_from_topic, faculty_id_from_payload,
+                                  payload_id, payload_non_numeric, self.valid_faculty_ids, self._valid_sorted)
+            
+            # Check for issues; non-dict payloads (heartbeat strings, bare statuses)
+            # carry no faculty_id, so only the topic rules apply to them
+            issues = [build(facts) for check, build in _TOPIC_RULES if check(facts)]
+            if is_dict:
+                issues.extend(build(facts) for check, build in _PAYLOAD_RULES if check(facts))
                 
-            message_record['issues'] = issues
-            self.received_messages.append(message_record)
+            # Count the message; the record itself is only kept in the NDJSON stream
+            message_record = MessageRecord(timestamp_ns=timestamp_ns, topic=topic, data=data, issues=issues)
+            with self._lock:
+                self.total_count += 1
+                if issues:
+                    self.bad_count += 1
+                    self.issue_counts.update(i['type'] for i in issues)
+            self._write_message_record(message_record)
             
             if issues:
-                self.problematic_messages.append(message_record)
-                logger.warning(f"🚨 ISSUE DETECTED: {topic} - {len(issues)} problems found")
-                for issue in issues:
-                    logger.warning(f"   - {issue['type']}: {issue['description']}")
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning("🚨 ISSUE DETECTED: %s - %d problems found", topic, len(issues))
+                    for issue in issues:
+                        logger.warning("   - %s: %s", issue['type'], issue['description'])
             else:
-                logger.debug(f"✅ Valid message: {topic}")
+                logger.debug("✅ Valid message: %s", topic)
                 
         except Exception as e:
             logger.error(f"❌ Error analyzing message from {topic}: {e}")
             
-    def _extract_faculty_id_from_topic(self, topic):
-        """Extract faculty ID from MQTT topic."""
-        try:
-            parts = topic.split('/')
-            
-            # Standard format: consultease/faculty/{id}/...
-            if len(parts) >= 3 and parts[0] == "consultease" and parts[1] == "faculty":
-                return int(parts[2])
+    def _write_message_record(self, message_record):
+        """Append one message record to the NDJSON stream."""
+        line = _json_dumps(message_record.to_dict()) + b'\n'
+        with self._lock:
+            if self._messages_file is not None:
+                self._messages_file.write(line)
                 
-            # Legacy format: faculty/{id}/...
-            elif len(parts) >= 2 and parts[0] == "faculty":
-                return int(parts[1])
+    def _close_messages_file(self):
+        """Flush and close the NDJSON stream."""
+        with self._lock:
+            if self._messages_file is not None:
+                self._messages_file.close()
+                self._messages_file = None
                 
-        except (ValueError, IndexError):
-            pass
-            
-        return None
+    @staticmethod
+    def _extract_faculty_id_from_topic(topic):
+        """Extract faculty ID from MQTT topic as an int, or None if the topic carries no numeric ID."""
+        # Standard format consultease/faculty/{id}/... or legacy format faculty/{id}/...
+        m = _TOPIC_RE.match(topic)
+        return int(m.group(1)) if m else None
         
     def _generate_validation_report(self):
         """Generate comprehensive validation report."""
@@ -210,8 +344,8 @@ class ESP32ConfigValidator:
         logger.info("=" * 60)
         
         # Summary statistics
-        total_messages = len(self.received_messages)
-        problematic_messages = len(self.problematic_messages)
+        total_messages = self.total_count
+        problematic_messages = self.bad_count
         success_rate = ((total_messages - problematic_messages) / total_messages * 100) if total_messages > 0 else 0
         
         logger.info(f"📈 SUMMARY STATISTICS:")
@@ -220,13 +354,8 @@ class ESP32ConfigValidator:
         logger.info(f"   Success rate: {success_rate:.1f}%")
         logger.info("")
         
-        # Issue breakdown
-        issue_counts = {}
-        for msg in self.problematic_messages:
-            for issue in msg['issues']:
-                issue_type = issue['type']
-                issue_counts[issue_type] = issue_counts.get(issue_type, 0) + 1
-                
+        # Issue breakdown (counted as messages arrived)
+        issue_counts = self.issue_counts
         if issue_counts:
             logger.info("🚨 ISSUE BREAKDOWN:")
             for issue_type, count in sorted(issue_counts.items()):
@@ -246,21 +375,21 @@ class ESP32ConfigValidator:
         """Generate configuration fix recommendations."""
         logger.info("💡 CONFIGURATION RECOMMENDATIONS:")
         
-        if 'LITERAL_FACULTY_ID_IN_TOPIC' in issue_counts or 'LITERAL_FACULTY_ID_IN_PAYLOAD' in issue_counts:
+        if ISSUE_LITERAL_TOPIC in issue_counts or ISSUE_LITERAL_PAYLOAD in issue_counts:
             logger.info("   🔧 ESP32 FIRMWARE COMPILATION ISSUE DETECTED:")
             logger.info("      - The ESP32 firmware is not properly compiling FACULTY_ID macro")
             logger.info("      - Check faculty_desk_unit/config.h: ensure FACULTY_ID is set to a number")
             logger.info("      - Recompile and upload firmware to ESP32")
             logger.info("      - Example: #define FACULTY_ID 1  (not #define FACULTY_ID \"FACULTY_ID\")")
             
-        if 'INVALID_FACULTY_ID_IN_TOPIC' in issue_counts or 'INVALID_FACULTY_ID_IN_PAYLOAD' in issue_counts:
+        if ISSUE_INVALID_TOPIC_ID in issue_counts or ISSUE_INVALID_PAYLOAD_ID in issue_counts:
             logger.info("   🏢 DATABASE SYNC ISSUE DETECTED:")
             logger.info("      - ESP32 configured with faculty ID not in database")
             logger.info("      - Add missing faculty records to database, or")
             logger.info("      - Update ESP32 config.h with valid faculty ID and recompile")
-            logger.info(f"      - Valid faculty IDs: {sorted(self.valid_faculty_ids)}")
+            logger.info(f"      - Valid faculty IDs: {self._valid_sorted}")
             
-        if 'FACULTY_ID_MISMATCH' in issue_counts:
+        if ISSUE_FACULTY_ID_MISMATCH in issue_counts:
             logger.info("   ⚡ FIRMWARE LOGIC ERROR DETECTED:")
             logger.info("      - ESP32 sending inconsistent faculty IDs in topic vs payload") 
             logger.info("      - Check ESP32 firmware for hardcoded faculty IDs")
@@ -272,39 +401,25 @@ class ESP32ConfigValidator:
     def _save_detailed_report(self):
         """Save detailed report to file."""
         try:
+            # Messages were already streamed to the NDJSON file; only the summary is written here
+            self._close_messages_file()
+            
             report_data = {
                 'timestamp': datetime.datetime.now().isoformat(),
                 'summary': {
-                    'total_messages': len(self.received_messages),
-                    'problematic_messages': len(self.problematic_messages),
-                    'valid_faculty_ids': sorted(self.valid_faculty_ids)
+                    'total_messages': self.total_count,
+                    'problematic_messages': self.bad_count,
+                    'valid_faculty_ids': self._valid_sorted
                 },
-                'all_messages': [
-                    {
-                        'timestamp': msg['timestamp'].isoformat(),
-                        'topic': msg['topic'],
-                        'data': msg['data'],
-                        'issues': msg['issues']
-                    }
-                    for msg in self.received_messages
-                ],
-                'problematic_messages': [
-                    {
-                        'timestamp': msg['timestamp'].isoformat(),
-                        'topic': msg['topic'],
-                        'data': msg['data'],
-                        'issues': msg['issues']
-                    }
-                    for msg in self.problematic_messages
-                ]
+                'messages_file': self._messages_filename
             }
             
-            filename = f"esp32_config_validation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"{self._report_stem}.json"
             
-            with open(filename, 'w') as f:
-                json.dump(report_data, f, indent=2, default=str)
+            with open(filename, 'wb') as f:
+                f.write(_json_dumps(report_data))
                 
-            logger.info(f"💾 Detailed report saved to: {filename}")
+            logger.info(f"💾 Detailed report saved to: {filename} (messages: {self._messages_filename})")
             
         except Exception as e:
             logger.error(f"❌ Error saving detailed report: {e}")
@@ -324,6 +439,8 @@ def main():
             
         # Run validation
         validator = ESP32ConfigValidator()
+        # Ctrl-C ends monitoring early but still produces the report
+        signal.signal(signal.SIGINT, lambda signum, frame: validator._stop.set())
         validator.start_validation(duration_minutes=2)  # 2 minute monitoring
         
     except KeyboardInterrupt:
@@ -2,19 +2,38 @@
 """
 Test script to compare BUSY vs ACKNOWLEDGE responses from ESP32.
 This will help identify why real-time updates aren't working for the BUSY button.
+
+Set MQTT_TEST_VERBOSE=1 to log every received payload; by default only the topic is logged.
 """
 
 import sys
 import os
+import re
 import json
 import time
+import socket
 import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
 # Add the central_system directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'central_system'))
 
+# orjson serializes straight to bytes several times faster; fall back to compact json
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -30,59 +49,193 @@ MESSAGES_TOPIC = f"consultease/faculty/{FACULTY_ID}/messages"
 UI_UPDATES_TOPIC = "consultease/ui/consultation_updates"
 SYSTEM_NOTIFICATIONS_TOPIC = "consultease/system/notifications"
 
+# Topics monitored for system reactions to the simulated responses
+MONITORED_TOPICS = (
+    RESPONSES_TOPIC,
+    UI_UPDATES_TOPIC,
+    SYSTEM_NOTIFICATIONS_TOPIC,
+    f"consultease/student/{FACULTY_ID}/notifications"
+)
+
+# ESP32 response types compared by this test; each runs on its own connection
+RESPONSE_TYPES = ("ACKNOWLEDGE", "BUSY")
+
+# Consultation ID a payload refers to: the system's notifications carry "consultation_id",
+# the ESP32 response echo carries "message_id" (sent as a string)
+_RUN_ID_RE = re.compile(rb'"(?:consultation_id|message_id)"\s*:\s*"?(\d+)')
+
+# Topics a healthy system publishes on after an ESP32 response; seeing all of them ends the wait early
+EXPECTED_RESPONSE_TOPICS = frozenset({RESPONSES_TOPIC, UI_UPDATES_TOPIC})
+RESPONSE_WAIT_TIMEOUT = 10  # seconds
+
+# Client ID prefix and session expiry so the broker keeps each tester's session between
+# back-to-back runs. The IDs are fixed per response type (consultease-test-acknowledge and
+# consultease-test-busy), so a second copy of this script running at the same time takes
+# over the session and the broker disconnects the first one
+MQTT_CLIENT_ID = "consultease-test"
+MQTT_SESSION_EXPIRY = 3600  # seconds
+CONNECT_TIMEOUT = 5  # seconds to wait for CONNACK
+
+# MQTT v5 DISCONNECT reason code sent when another client connects with the same client ID
+REASON_SESSION_TAKEN_OVER = 142
+
+# Captured messages kept per test run; older ones are dropped on long soak runs
+MAX_CAPTURED_MESSAGES = 10000
+
+# Full payload dumps per received message are opt-in; CI runs keep the one-line topic log
+VERBOSE = os.environ.get('MQTT_TEST_VERBOSE', '0') == '1'
+
+# Per-message trace lines are logged in one batch at this interval, off the paho network thread
+TRACE_FLUSH_INTERVAL = 0.1  # seconds
+
+# Offset from the monotonic clock to wall-clock time, captured once at startup
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def payload_text(payload):
+    """Decode a captured raw payload for display, pretty-printing JSON when possible."""
+    text = payload.decode('utf-8', errors='replace')
+    try:
+        return json.dumps(json.loads(text), indent=2)
+    except ValueError:
+        return text
+
+
+def format_time(t_ns):
+    """Format a time.monotonic_ns() receive time as a wall-clock HH:MM:SS.mmm string."""
+    return datetime.fromtimestamp((t_ns + _EPOCH_OFFSET_NS) / 1e9).strftime("%H:%M:%S.%f")[:-3]
+
 class BusyVsAcknowledgeTester:
-    def __init__(self):
-        self.client = mqtt.Client()
+    def __init__(self, response_type, qos=1, client_id=None):
+        self.response_type = response_type
+        self.client_id = client_id or f"{MQTT_CLIENT_ID}-{response_type.lower()}"
+        self.client = mqtt.Client(
+            mqtt.CallbackAPIVersion.VERSION2,
+            client_id=self.client_id,
+            protocol=mqtt.MQTTv5
+        )
         self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
         self.client.on_message = self.on_message
         
-        self.received_messages = []
+        # Captured messages as parallel ring buffers (one entry per message in each); the
+        # lock keeps them aligned between the paho thread and the test thread
+        self.capture_lock = threading.Lock()
+        self.msg_topics = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        self.msg_times = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        self.msg_payloads = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        # Messages with no consultation/message ID (e.g. error notifications), which cannot be
+        # attributed to either run; kept apart so compare_results can still report them
+        self.unattributed_topics = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        self.unattributed_times = deque(maxlen=MAX_CAPTURED_MESSAGES)
+        self.seen_topics = set()
+        self.expected_topics = set()
+        self.done_event = threading.Event()
+        self.connected = threading.Event()
+        self.taken_over = threading.Event()
+        
+        # Per-message traces queued by on_message and logged in batches by the flush thread
+        self.pending_traces = deque()
+        self.trace_stop = threading.Event()
+        self.trace_thread = threading.Thread(target=self.flush_traces, name="mqtt-trace-flush", daemon=True)
         self.test_consultation_id = int(time.time())  # Use timestamp as unique ID
+        self.qos = qos  # QoS for test publishes; at-least-once is enough for this comparison
         
-    def on_connect(self, client, userdata, flags, rc):
-        logger.info(f"Connected to MQTT broker with result code {rc}")
+        # ESP32 response fields that never change; the None entries are filled per response
+        self.response_template = {
+            "faculty_id": FACULTY_ID,
+            "faculty_name": "Cris Angelo Salonga",
+            "response_type": None,
+            "message_id": None,
+            "timestamp": None,
+            "faculty_present": True,
+            "response_method": "physical_button",
+            "status": None
+        }
+        
+    def on_connect(self, client, userdata, flags, reason_code, properties):
+        logger.info(f"Connected to MQTT broker with result code {reason_code}")
+        if reason_code.is_failure:
+            return
         
-        # Subscribe to all relevant topics to monitor responses
-        topics = [
-            RESPONSES_TOPIC,
-            UI_UPDATES_TOPIC,
-            SYSTEM_NOTIFICATIONS_TOPIC,
-            f"consultease/student/{FACULTY_ID}/notifications"
-        ]
+        # Send the small test publishes immediately instead of letting Nagle's algorithm hold them back
+        sock = client.socket()
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError as e:
+                logger.warning(f"Could not set TCP_NODELAY on MQTT socket: {e}")
+        
+        # Subscribe to all relevant topics to monitor responses in a single SUBSCRIBE. This is
+        # sent even on a resumed session: it is idempotent and picks up edits to MONITORED_TOPICS
+        client.subscribe([(topic, 0) for topic in MONITORED_TOPICS])
+        logger.info(f"Subscribed to: {', '.join(MONITORED_TOPICS)}")
         
-        for topic in topics:
-            client.subscribe(topic)
-            logger.info(f"Subscribed to: {topic}")
+        self.connected.set()
+    
+    def on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
+        if reason_code == REASON_SESSION_TAKEN_OVER:
+            logger.error(f"❌ MQTT session '{self.client_id}' was taken over by another client with the same ID "
+                         f"- is another copy of this test running?")
+            self.taken_over.set()
+            self.done_event.set()  # end any pending wait now instead of reporting a timeout
     
     def on_message(self, client, userdata, msg):
         try:
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            t_ns = time.monotonic_ns()  # formatted only when results are reported
             topic = msg.topic
+            payload = msg.payload  # raw bytes; decoded only when displayed
+            # Both tests run at once and see each other's traffic; keep only messages
+            # about this run's own consultation, and set aside those without an ID
+            match = _RUN_ID_RE.search(payload)
+            if match is None:
+                with self.capture_lock:
+                    self.unattributed_topics.append(topic)
+                    self.unattributed_times.append(t_ns)
+                return
+            if int(match.group(1)) != self.test_consultation_id:
+                return
             
-            try:
-                payload = json.loads(msg.payload.decode())
-                payload_str = json.dumps(payload, indent=2)
-            except:
-                payload_str = msg.payload.decode()
-                
-            log_entry = {
-                'timestamp': timestamp,
-                'topic': topic,
-                'payload': payload_str
-            }
-            
-            self.received_messages.append(log_entry)
+            with self.capture_lock:
+                self.msg_topics.append(topic)
+                self.msg_times.append(t_ns)
+                self.msg_payloads.append(payload)
+            self.seen_topics.add(topic)
+            if self.expected_topics and self.seen_topics >= self.expected_topics:
+                self.done_event.set()
             
-            logger.info(f"📨 [{timestamp}] {topic}")
-            logger.info(f"    {payload_str}")
+            # Formatting and the logging lock are left to the flush thread
+            if logger.isEnabledFor(logging.INFO):
+                self.pending_traces.append((t_ns, topic, payload))
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
     
+    def drain_traces(self):
+        """Log every queued per-message trace in a single logger call."""
+        batch = []
+        while True:
+            try:
+                t_ns, topic, payload = self.pending_traces.popleft()
+            except IndexError:
+                break
+            if VERBOSE:
+                batch.append(f"📨 [{format_time(t_ns)}] {topic}\n    {payload_text(payload)}")
+            else:
+                batch.append(f"📨 [{format_time(t_ns)}] {topic}")
+        if batch:
+            logger.info("\n".join(batch))
+    
+    def flush_traces(self):
+        """Flush thread: log queued traces every TRACE_FLUSH_INTERVAL until stopped."""
+        while not self.trace_stop.wait(TRACE_FLUSH_INTERVAL):
+            self.drain_traces()
+        self.drain_traces()
+    
     def send_test_consultation(self):
         """Send a test consultation message to ESP32."""
         logger.info("=" * 60)
-        logger.info("SENDING TEST CONSULTATION")
+        logger.info(f"SENDING TEST CONSULTATION ({self.response_type} test)")
         logger.info("=" * 60)
         
         consultation_message = f"CID:{self.test_consultation_id} From:Test Student (SID:12345): Test consultation for busy vs acknowledge comparison"
@@ -90,11 +243,11 @@ class BusyVsAcknowledgeTester:
         logger.info(f"📤 Sending to topic: {MESSAGES_TOPIC}")
         logger.info(f"📤 Message: {consultation_message}")
         
-        result = self.client.publish(MESSAGES_TOPIC, consultation_message, qos=2)
+        result = self.client.publish(MESSAGES_TOPIC, consultation_message, qos=self.qos)
         
         if result.rc == mqtt.MQTT_ERR_SUCCESS:
             logger.info("✅ Test consultation sent successfully")
-            logger.info("💡 ESP32 should now display the consultation message")
+            logger.info("💡 Both test runs target the same ESP32, so its display shows whichever consultation arrived last")
             return True
         else:
             logger.error(f"❌ Failed to send consultation, error code: {result.rc}")
@@ -107,21 +260,19 @@ class BusyVsAcknowledgeTester:
         logger.info("=" * 60)
         
         # Create response exactly like ESP32 would send it
-        response_data = {
-            "faculty_id": FACULTY_ID,
-            "faculty_name": "Cris Angelo Salonga",
-            "response_type": response_type,
-            "message_id": str(self.test_consultation_id),
-            "timestamp": str(int(time.time() * 1000)),
-            "faculty_present": True,
-            "response_method": "physical_button",
-            "status": f"Professor {'acknowledges the request' if response_type == 'ACKNOWLEDGE' else 'is currently busy'}"
-        }
+        response_data = self.response_template.copy()
+        response_data["response_type"] = response_type
+        response_data["message_id"] = str(self.test_consultation_id)
+        response_data["timestamp"] = str(int(time.time() * 1000))
+        response_data["status"] = f"Professor {'acknowledges the request' if response_type == 'ACKNOWLEDGE' else 'is currently busy'}"
+        
+        # Serialize once; the same bytes are logged and published
+        payload = json_dumps(response_data)
         
         logger.info(f"📤 Sending {response_type} response to topic: {RESPONSES_TOPIC}")
-        logger.info(f"📤 Response data: {json.dumps(response_data, indent=2)}")
+        logger.info(f"📤 Response data: {payload.decode('utf-8')}")
         
-        result = self.client.publish(RESPONSES_TOPIC, json.dumps(response_data), qos=2)
+        result = self.client.publish(RESPONSES_TOPIC, payload, qos=self.qos)
         
         if result.rc == mqtt.MQTT_ERR_SUCCESS:
             logger.info(f"✅ {response_type} response sent successfully")
@@ -130,129 +281,202 @@ class BusyVsAcknowledgeTester:
             logger.error(f"❌ Failed to send {response_type} response, error code: {result.rc}")
             return False
     
-    def run_comparison_test(self):
-        """Run the complete comparison test."""
-        logger.info("🚀 Starting BUSY vs ACKNOWLEDGE comparison test...")
-        
-        # Connect to MQTT
-        try:
-            self.client.connect(MQTT_BROKER, MQTT_PORT, 60)
-            self.client.loop_start()
-            time.sleep(2)  # Wait for connection
-        except Exception as e:
-            logger.error(f"Failed to connect to MQTT broker: {e}")
-            return False
-        
-        # Test 1: ACKNOWLEDGE Response
-        logger.info("\n" + "="*60)
-        logger.info("TEST 1: ACKNOWLEDGE RESPONSE")
-        logger.info("="*60)
-        
-        self.test_consultation_id = int(time.time())
-        self.received_messages.clear()
-        
-        # Send consultation and wait
-        if not self.send_test_consultation():
-            return False
-        time.sleep(3)
-        
-        # Simulate ACKNOWLEDGE response
-        if not self.simulate_esp32_response("ACKNOWLEDGE"):
-            return False
-        
-        # Wait for all system responses
-        logger.info("⏳ Waiting 10 seconds for ACKNOWLEDGE response processing...")
-        time.sleep(10)
-        
-        acknowledge_messages = self.received_messages.copy()
-        
-        # Test 2: BUSY Response
-        logger.info("\n" + "="*60)
-        logger.info("TEST 2: BUSY RESPONSE")
-        logger.info("="*60)
-        
-        self.test_consultation_id = int(time.time()) + 1
-        self.received_messages.clear()
-        
-        # Send consultation and wait
-        if not self.send_test_consultation():
-            return False
-        time.sleep(3)
-        
-        # Simulate BUSY response
-        if not self.simulate_esp32_response("BUSY"):
+    def reset_capture(self, expected_topics):
+        """Clear captured messages and arm the wait for the given topics."""
+        self.done_event.clear()
+        with self.capture_lock:
+            self.msg_topics.clear()
+            self.msg_times.clear()
+            self.msg_payloads.clear()
+            self.unattributed_topics.clear()
+            self.unattributed_times.clear()
+        self.seen_topics.clear()
+        self.expected_topics = set(expected_topics)
+    
+    def snapshot_messages(self):
+        """Copy the captured (topics, times, payloads) buffers for later comparison."""
+        with self.capture_lock:
+            return self.msg_topics.copy(), self.msg_times.copy(), self.msg_payloads.copy()
+    
+    def snapshot_unattributed(self):
+        """Copy the (topics, times) buffers of messages that carried no consultation ID."""
+        with self.capture_lock:
+            return self.unattributed_topics.copy(), self.unattributed_times.copy()
+    
+    def wait_for_responses(self, response_type):
+        """
+        Wait until every expected topic was seen, or the timeout expires.
+        
+        Returns:
+            bool: False if the MQTT session was taken over, True otherwise
+        """
+        logger.info(f"⏳ Waiting up to {RESPONSE_WAIT_TIMEOUT} seconds for {response_type} response processing...")
+        if not self.taken_over.is_set():
+            self.done_event.wait(timeout=RESPONSE_WAIT_TIMEOUT)
+        
+        if self.taken_over.is_set():
+            logger.error(f"❌ {response_type} test aborted: MQTT session taken over by another client")
             return False
-        
-        # Wait for all system responses
-        logger.info("⏳ Waiting 10 seconds for BUSY response processing...")
-        time.sleep(10)
-        
-        busy_messages = self.received_messages.copy()
-        
-        # Compare Results
-        self.compare_results(acknowledge_messages, busy_messages)
-        
-        # Cleanup
-        self.client.loop_stop()
-        self.client.disconnect()
-        
+        if self.done_event.is_set():
+            logger.info(f"✅ All expected topics received for {response_type} response")
+        else:
+            missing = self.expected_topics - self.seen_topics
+            logger.warning(f"⚠️ Timed out waiting for {response_type} response topics: {missing}")
         return True
     
-    def compare_results(self, acknowledge_msgs, busy_msgs):
-        """Compare ACKNOWLEDGE vs BUSY response results."""
-        logger.info("\n" + "="*60)
-        logger.info("COMPARISON RESULTS")
-        logger.info("="*60)
-        
-        logger.info(f"📊 ACKNOWLEDGE Response Messages: {len(acknowledge_msgs)}")
-        for i, msg in enumerate(acknowledge_msgs, 1):
-            logger.info(f"   {i}. [{msg['timestamp']}] {msg['topic']}")
-        
-        logger.info(f"\n📊 BUSY Response Messages: {len(busy_msgs)}")
-        for i, msg in enumerate(busy_msgs, 1):
-            logger.info(f"   {i}. [{msg['timestamp']}] {msg['topic']}")
-        
-        # Analyze differences
-        logger.info(f"\n🔍 ANALYSIS:")
-        
-        ack_topics = set(msg['topic'] for msg in acknowledge_msgs)
-        busy_topics = set(msg['topic'] for msg in busy_msgs)
+    def run_response_test(self, consultation_id):
+        """
+        Run one consultation + simulated ESP32 response on this tester's own connection.
         
-        missing_in_busy = ack_topics - busy_topics
-        missing_in_ack = busy_topics - ack_topics
+        Returns:
+            snapshot_messages() tuple of the messages captured for the response, or None on failure
+        """
+        response_type = self.response_type
+        self.trace_thread.start()
         
-        if missing_in_busy:
-            logger.warning(f"❌ Topics missing in BUSY response: {missing_in_busy}")
-        
-        if missing_in_ack:
-            logger.warning(f"❌ Topics missing in ACKNOWLEDGE response: {missing_in_ack}")
-        
-        if len(acknowledge_msgs) == len(busy_msgs) and not missing_in_busy and not missing_in_ack:
-            logger.info("✅ Both responses triggered the same number of messages on the same topics")
-        else:
-            logger.warning("⚠️ Responses differ in message count or topics")
-        
-        # Check for UI update messages specifically
-        ui_updates_ack = [msg for msg in acknowledge_msgs if 'ui/consultation_updates' in msg['topic']]
-        ui_updates_busy = [msg for msg in busy_msgs if 'ui/consultation_updates' in msg['topic']]
-        
-        logger.info(f"\n📱 UI Update Messages:")
-        logger.info(f"   ACKNOWLEDGE: {len(ui_updates_ack)} messages")
-        logger.info(f"   BUSY: {len(ui_updates_busy)} messages")
-        
-        if len(ui_updates_ack) > 0 and len(ui_updates_busy) == 0:
-            logger.error("❌ CRITICAL: BUSY responses are not triggering UI updates!")
-        elif len(ui_updates_ack) == 0 and len(ui_updates_busy) > 0:
-            logger.error("❌ CRITICAL: ACKNOWLEDGE responses are not triggering UI updates!")
-        elif len(ui_updates_ack) > 0 and len(ui_updates_busy) > 0:
-            logger.info("✅ Both responses are triggering UI updates")
-        else:
-            logger.warning("⚠️ Neither response triggered UI updates")
+        try:
+            # Connect to MQTT
+            try:
+                connect_properties = Properties(PacketTypes.CONNECT)
+                connect_properties.SessionExpiryInterval = MQTT_SESSION_EXPIRY
+                self.client.loop_start()
+                self.client.connect_async(MQTT_BROKER, MQTT_PORT, 60, clean_start=False, properties=connect_properties)
+            except Exception as e:
+                logger.error(f"Failed to connect to MQTT broker: {e}")
+                return None
+            
+            # Wake on CONNACK instead of sleeping a fixed time
+            if not self.connected.wait(timeout=CONNECT_TIMEOUT):
+                logger.error(f"Failed to connect to MQTT broker within {CONNECT_TIMEOUT} seconds")
+                return None
+            
+            logger.info("\n" + "="*60)
+            logger.info(f"{response_type} RESPONSE TEST")
+            logger.info("="*60)
+            
+            self.test_consultation_id = consultation_id
+            self.reset_capture(EXPECTED_RESPONSE_TOPICS)
+            
+            # Send consultation and wait
+            if not self.send_test_consultation():
+                return None
+            time.sleep(3)
+            
+            # Simulate the ESP32 response
+            if not self.simulate_esp32_response(response_type):
+                return None
+            
+            # Wait for all system responses
+            if not self.wait_for_responses(response_type):
+                return None
+            
+            return self.snapshot_messages()
+        finally:
+            # Cleanup
+            self.client.disconnect()
+            self.client.loop_stop()
+            self.trace_stop.set()
+            self.trace_thread.join()
+
+
+def compare_results(acknowledge_msgs, busy_msgs, unattributed_msgs=None):
+    """
+    Compare ACKNOWLEDGE vs BUSY response results given as snapshot_messages() tuples.
+    
+    unattributed_msgs is an optional snapshot_unattributed() tuple of the messages
+    without a consultation ID seen while the tests ran.
+    """
+    ack_topics, ack_times, _ = acknowledge_msgs
+    busy_topics, busy_times, _ = busy_msgs
+
+    logger.info("\n" + "="*60)
+    logger.info("COMPARISON RESULTS")
+    logger.info("="*60)
+
+    logger.info(f"📊 ACKNOWLEDGE Response Messages: {len(ack_topics)}")
+    for i, (t_ns, topic) in enumerate(zip(ack_times, ack_topics), 1):
+        logger.info(f"   {i}. [{format_time(t_ns)}] {topic}")
+
+    logger.info(f"\n📊 BUSY Response Messages: {len(busy_topics)}")
+    for i, (t_ns, topic) in enumerate(zip(busy_times, busy_topics), 1):
+        logger.info(f"   {i}. [{format_time(t_ns)}] {topic}")
+
+    # Analyze differences
+    logger.info(f"\n🔍 ANALYSIS:")
+
+    # One pass per run; topic sets and per-topic counts both come from the Counter
+    ack_counts = Counter(ack_topics)
+    busy_counts = Counter(busy_topics)
+
+    missing_in_busy = ack_counts.keys() - busy_counts.keys()
+    missing_in_ack = busy_counts.keys() - ack_counts.keys()
+
+    if missing_in_busy:
+        logger.warning(f"❌ Topics missing in BUSY response: {missing_in_busy}")
+
+    if missing_in_ack:
+        logger.warning(f"❌ Topics missing in ACKNOWLEDGE response: {missing_in_ack}")
+
+    if len(ack_topics) == len(busy_topics) and not missing_in_busy and not missing_in_ack:
+        logger.info("✅ Both responses triggered the same number of messages on the same topics")
+    else:
+        logger.warning("⚠️ Responses differ in message count or topics")
+
+    # Check for UI update messages specifically
+    ui_updates_ack = ack_counts[UI_UPDATES_TOPIC]
+    ui_updates_busy = busy_counts[UI_UPDATES_TOPIC]
+
+    logger.info(f"\n📱 UI Update Messages:")
+    logger.info(f"   ACKNOWLEDGE: {ui_updates_ack} messages")
+    logger.info(f"   BUSY: {ui_updates_busy} messages")
+
+    if ui_updates_ack > 0 and ui_updates_busy == 0:
+        logger.error("❌ CRITICAL: BUSY responses are not triggering UI updates!")
+    elif ui_updates_ack == 0 and ui_updates_busy > 0:
+        logger.error("❌ CRITICAL: ACKNOWLEDGE responses are not triggering UI updates!")
+    elif ui_updates_ack > 0 and ui_updates_busy > 0:
+        logger.info("✅ Both responses are triggering UI updates")
+    else:
+        logger.warning("⚠️ Neither response triggered UI updates")
+
+    if unattributed_msgs is not None:
+        unattributed_topics, unattributed_times = unattributed_msgs
+        logger.info(f"\n❔ Messages without a consultation ID: {len(unattributed_topics)}")
+        for i, (t_ns, topic) in enumerate(zip(unattributed_times, unattributed_topics), 1):
+            logger.info(f"   {i}. [{format_time(t_ns)}] {topic}")
+        if unattributed_topics:
+            logger.warning(f"⚠️ {len(unattributed_topics)} messages could not be attributed to either response "
+                           f"and are not counted above: {dict(Counter(unattributed_topics))}")
+
+
+def run_comparison_test(qos=1):
+    """Run the ACKNOWLEDGE and BUSY tests concurrently on two connections and compare them."""
+    logger.info("🚀 Starting BUSY vs ACKNOWLEDGE comparison test...")
+    
+    # The two tests are independent, so each gets its own client session and runs in parallel
+    ack_tester = BusyVsAcknowledgeTester("ACKNOWLEDGE", qos=qos)
+    busy_tester = BusyVsAcknowledgeTester("BUSY", qos=qos)
+    consultation_id = int(time.time())  # Use timestamp as unique ID
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ack_future = executor.submit(ack_tester.run_response_test, consultation_id)
+        busy_future = executor.submit(busy_tester.run_response_test, consultation_id + 1)
+        acknowledge_messages = ack_future.result()
+        busy_messages = busy_future.result()
+    
+    if acknowledge_messages is None or busy_messages is None:
+        return False
+    
+    # Both connections subscribe to the same topics over overlapping windows, so one
+    # tester's unattributed bucket covers the ID-less traffic of both runs
+    compare_results(acknowledge_messages, busy_messages, ack_tester.snapshot_unattributed())
+    
+    return True
+
 
 if __name__ == "__main__":
-    tester = BusyVsAcknowledgeTester()
     try:
-        success = tester.run_comparison_test()
+        success = run_comparison_test()
         if success:
             logger.info("✅ Comparison test completed successfully")
         else:
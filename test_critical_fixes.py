@@ -13,6 +13,7 @@ Run this after applying the fixes to verify everything is working.
 """
 
 import logging
+import re
 import time
 import datetime
 import json
@@ -27,6 +28,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Markers of the MQTT stop() stability improvements, found in one scan of its source
+_STOP_FEATURES_RE = re.compile(
+    r'(?P<timeout>timeout)|(?P<force>force)|(?P<cleanup>self\.client\s*=\s*None)',
+    re.IGNORECASE
+)
+
 class CriticalFixesVerifier:
     def __init__(self):
         self.test_results = []
@@ -233,9 +240,10 @@ class CriticalFixesVerifier:
                 source = inspect.getsource(stop_method)
                 
                 # Check for key improvements
-                has_timeout_handling = 'timeout' in source.lower()
-                has_client_cleanup = 'self.client = None' in source
-                has_force_disconnect = 'force' in source.lower()
+                found = {m.lastgroup for m in _STOP_FEATURES_RE.finditer(source)}
+                has_timeout_handling = 'timeout' in found
+                has_client_cleanup = 'cleanup' in found
+                has_force_disconnect = 'force' in found
                 
                 test_result['details'].extend([
                     f"Has timeout handling: {has_timeout_handling}",
@@ -279,9 +287,19 @@ class CriticalFixesVerifier:
                 'esp32_config_validator.py'
             ]
             
+            # List each directory once instead of stat-ing every file
+            dir_entries = {}
+            for directory in {os.path.dirname(file_path) or '.' for file_path in memory_files}:
+                try:
+                    with os.scandir(directory) as entries:
+                        dir_entries[directory] = {entry.name for entry in entries}
+                except FileNotFoundError:
+                    dir_entries[directory] = set()
+            
             files_exist = []
             for file_path in memory_files:
-                exists = os.path.exists(file_path)
+                directory, name = os.path.split(file_path)
+                exists = name in dir_entries[directory or '.']
                 files_exist.append(exists)
                 test_result['details'].append(f"{file_path}: {'EXISTS' if exists else 'MISSING'}")
             